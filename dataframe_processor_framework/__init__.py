@@ -13,17 +13,52 @@ DataFrameProcessorFramework
 - launch_processor_ui: Функция для инициализации и отображения UI.
 """
 
-from .colab_processor_ui import DataProcessorUI
-from .data_processor import DataFrameProcessor
-from .drive_io_handler import DriveIOHandler
-from typing import Optional, List, Dict, Any, Callable
+from typing import TYPE_CHECKING
 
-import pandas as pd
-import ipywidgets as widgets
-from IPython.display import display
+if TYPE_CHECKING:
+    import pandas as pd
+    from .colab_processor_ui import DataProcessorUI
+    from .data_processor import DataFrameProcessor
+    from .drive_io_handler import DriveIOHandler
 
 
-def launch_processor_ui(input_df: pd.DataFrame) -> DataProcessorUI:
+# Модули с классами импортируются при первом обращении (PEP 562), чтобы импорт
+# пакета не загружал pandas, ipywidgets и IPython, если они не используются
+_LAZY_ATTRIBUTES = {
+    'DataProcessorUI': '.colab_processor_ui',
+    'DataFrameProcessor': '.data_processor',
+    'DriveIOHandler': '.drive_io_handler',
+}
+
+
+def __getattr__(name: str):
+    """
+    Импортирует класс пакета при первом обращении к нему.
+    
+    Args:
+        name (str): Имя атрибута пакета.
+        
+    Returns:
+        Класс из соответствующего модуля пакета.
+        
+    Raises:
+        AttributeError: Если атрибут не найден.
+    """
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+def launch_processor_ui(input_df: 'pd.DataFrame') -> 'DataProcessorUI':
     """
     Инициализирует и отображает DataProcessorUI в среде Google Colab.
     
@@ -59,6 +94,8 @@ def launch_processor_ui(input_df: pd.DataFrame) -> DataProcessorUI:
               "Custom widget manager not enabled. "
               "This UI is designed for Colab environment.")
     
+    from .colab_processor_ui import DataProcessorUI
+    
     # Создаем и отображаем UI
     ui_instance = DataProcessorUI(input_df=input_df)
     ui_instance.display()
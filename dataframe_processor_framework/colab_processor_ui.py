@@ -9,11 +9,86 @@ import pandas as pd
 import ipywidgets as widgets
 from IPython.display import display, HTML
 import json
-from typing import Optional, List, Dict, Any, Callable
+import html
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Callable, Tuple, Iterator
 
-from .data_processor import DataFrameProcessor
+from .data_processor import DataFrameProcessor, logger as _processor_logger
 from .drive_io_handler import DriveIOHandler
 
+# orjson (если установлен) быстрее разбирает JSON из текстовых полей
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Максимальное число строк, при котором df.info() подсчитывает непустые значения.
+# Для больших DataFrame этот подсчет требует полного прохода по данным.
+_INFO_COUNTS_MAX_ROWS = 100_000
+
+# Максимальное число колонок в предпросмотре первых строк DataFrame
+_PREVIEW_MAX_COLUMNS = 20
+
+# Минимальный интервал (в секундах) между обновлениями лога обработки в браузере
+_LOG_FLUSH_INTERVAL = 0.2
+
+# Варианты выпадающих списков. Общие для всех экземпляров DataProcessorUI
+_TIME_ERRORS_OPTIONS = ('raise', 'coerce', 'ignore')
+_MISSING_STRATEGIES = ('ffill', 'bfill', 'dropna_rows', 'dropna_cols', 'interpolate',
+                       'fill_constant', 'fill_mean', 'fill_median', 'fill_zero')
+_INTERPOLATE_METHODS = ('linear', 'time', 'index', 'pad', 'nearest', 'zero',
+                        'slinear', 'quadratic', 'cubic', 'spline', 'barycentric',
+                        'polynomial', 'krogh', 'piecewise_polynomial', 'pchip', 'akima')
+_CONVERT_ERRORS_OPTIONS = ('raise', 'ignore')
+_DUPLICATES_KEEP_OPTIONS = (('Первое вхождение', 'first'),
+                            ('Последнее вхождение', 'last'),
+                            ('Удалить все дубликаты', False))
+_SAVE_FORMATS = ('parquet', 'csv', 'feather', 'pickle')
+_SAVE_COMPRESSIONS = (('zstd', 'zstd'), ('snappy', 'snappy'), ('Без сжатия', None))
+
+
+class _LogHandler(logging.Handler):
+    """
+    Обработчик logging, передающий каждое сообщение в функцию логирования UI.
+    """
+    
+    def __init__(self, log_func: Callable[[str], None]):
+        """
+        Args:
+            log_func (Callable[[str], None]): Функция, принимающая одно сообщение лога.
+        """
+        super().__init__(level=logging.INFO)
+        self._log_func = log_func
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        self._log_func(record.getMessage())
+
+
+@contextmanager
+def _capture_processor_log(log_func: Callable[[str], None]) -> Iterator[None]:
+    """
+    Перенаправляет сообщения DataFrameProcessor (logging, уровень INFO) в функцию
+    логирования UI на время выполнения блока with.
+    
+    Args:
+        log_func (Callable[[str], None]): Функция, принимающая одно сообщение лога.
+    """
+    handler = _LogHandler(log_func)
+    previous_level = _processor_logger.level
+    _processor_logger.addHandler(handler)
+    _processor_logger.setLevel(logging.INFO)
+    try:
+        yield
+    finally:
+        _processor_logger.removeHandler(handler)
+        _processor_logger.setLevel(previous_level)
+
 
 class DataProcessorUI:
     """
@@ -35,6 +110,11 @@ class DataProcessorUI:
         self.processor = DataFrameProcessor(self.raw_df)
         self.drive_saver = DriveIOHandler()
         
+        # Поток для фонового сохранения на Google Drive. Сохранения выполняются
+        # по очереди: без временной метки (или в пределах одной секунды) два
+        # сохранения записывали бы один и тот же файл одновременно
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        
         # Создаем виджеты UI
         self._create_widgets()
         
@@ -62,7 +142,7 @@ class DataProcessorUI:
         )
         
         self.dropdown_time_errors = widgets.Dropdown(
-            options=['raise', 'coerce', 'ignore'],
+            options=_TIME_ERRORS_OPTIONS,
             value='raise',
             description='При ошибках:',
             disabled=False,
@@ -74,6 +154,13 @@ class DataProcessorUI:
             disabled=False
         )
         
+        self.text_datetime_format = widgets.Text(
+            value='',
+            placeholder='%Y-%m-%d %H:%M:%S',
+            description='Формат (пусто=авто):',
+            disabled=False
+        )
+        
         # --- Обработка пропусков ---
         self.cb_handle_missing = widgets.Checkbox(
             value=False,
@@ -82,8 +169,7 @@ class DataProcessorUI:
         )
         
         self.dropdown_missing_strategy = widgets.Dropdown(
-            options=['ffill', 'bfill', 'dropna_rows', 'dropna_cols', 'interpolate', 
-                    'fill_constant', 'fill_mean', 'fill_median', 'fill_zero'],
+            options=_MISSING_STRATEGIES,
             value='ffill',
             description='Стратегия:',
             disabled=False,
@@ -97,9 +183,7 @@ class DataProcessorUI:
         )
         
         self.dropdown_interpolate_method = widgets.Dropdown(
-            options=['linear', 'time', 'index', 'pad', 'nearest', 'zero', 
-                    'slinear', 'quadratic', 'cubic', 'spline', 'barycentric', 
-                    'polynomial', 'krogh', 'piecewise_polynomial', 'pchip', 'akima'],
+            options=_INTERPOLATE_METHODS,
             value='linear',
             description='Метод интерполяции:',
             disabled=False,
@@ -128,7 +212,7 @@ class DataProcessorUI:
         )
         
         self.dropdown_convert_errors = widgets.Dropdown(
-            options=['raise', 'ignore'],
+            options=_CONVERT_ERRORS_OPTIONS,
             value='raise',
             description='При ошибках:',
             disabled=False,
@@ -142,9 +226,7 @@ class DataProcessorUI:
         )
         
         self.dropdown_duplicates_keep = widgets.Dropdown(
-            options=[('Первое вхождение', 'first'), 
-                    ('Последнее вхождение', 'last'), 
-                    ('Удалить все дубликаты', False)],
+            options=_DUPLICATES_KEEP_OPTIONS,
             value='first',
             description='Сохранить:',
             disabled=False,
@@ -187,6 +269,19 @@ class DataProcessorUI:
             layout={'width': '400px'}
         )
         
+        # =================== ВИДЖЕТЫ ОПТИМИЗАЦИИ ПАМЯТИ ===================
+        self.cb_shrink_dtypes = widgets.Checkbox(
+            value=False,
+            description='Уменьшить типы данных (int/float/category)',
+            disabled=False
+        )
+        
+        self.cb_arrow_strings = widgets.Checkbox(
+            value=False,
+            description='Хранить строки в формате Arrow (string[pyarrow])',
+            disabled=False
+        )
+        
         # =================== ВИДЖЕТЫ ДЛЯ СОХРАНЕНИЯ ===================
         self.text_save_filename_prefix = widgets.Text(
             value='processed_data',
@@ -196,12 +291,19 @@ class DataProcessorUI:
         )
         
         self.dropdown_save_format = widgets.Dropdown(
-            options=['parquet', 'csv', 'feather', 'pickle'],
+            options=_SAVE_FORMATS,
             value='parquet',
             description='Формат:',
             disabled=False,
         )
         
+        self.dropdown_save_compression = widgets.Dropdown(
+            options=_SAVE_COMPRESSIONS,
+            value='zstd',
+            description='Сжатие:',
+            disabled=False,
+        )
+        
         self.cb_include_timestamp = widgets.Checkbox(
             value=True,
             description='Добавить временную метку к имени файла',
@@ -223,6 +325,16 @@ class DataProcessorUI:
                    'overflow_y': 'auto', 'padding': '10px'}
         )
         
+        # Строки лога накапливаются в буфере и выводятся одним обновлением виджета
+        # не чаще чем раз в _LOG_FLUSH_INTERVAL секунд, а не отдельным сообщением
+        # в браузер на каждый print
+        self.log_view = widgets.HTML(value='')
+        self._log_buf: List[str] = []
+        self._log_lock = threading.Lock()
+        self._last_log_flush = 0.0
+        with self.log_output:
+            display(self.log_view)
+        
         self.processed_df_preview_output = widgets.Output(
             layout={'border': '1px solid #ddd', 'padding': '10px'}
         )
@@ -230,115 +342,182 @@ class DataProcessorUI:
         # =================== ПРИВЯЗКА ОБРАБОТЧИКОВ ===================
         self.process_button.on_click(self._on_process_button_clicked)
         
+        # Текстовые поля разбираются при изменении, а результат кэшируется,
+        # чтобы не повторять разбор при каждом нажатии кнопки
+        self.textarea_column_types.observe(self._parse_column_types, names='value')
+        self.textarea_rename_map.observe(self._parse_rename_map, names='value')
+        self.text_missing_subset_cols.observe(self._parse_missing_subset_cols, names='value')
+        self.text_duplicates_subset.observe(self._parse_duplicates_subset, names='value')
+        self.text_columns_to_keep.observe(self._parse_columns_to_keep, names='value')
+        
+        self._parse_column_types()
+        self._parse_rename_map()
+        self._parse_missing_subset_cols()
+        self._parse_duplicates_subset()
+        self._parse_columns_to_keep()
+        
         # =================== ДИНАМИЧЕСКОЕ ОТОБРАЖЕНИЕ ВИДЖЕТОВ ===================
         # Обработчики для отображения/скрытия виджетов в зависимости от выбора
         self._setup_dynamic_widgets()
         
-    def _setup_dynamic_widgets(self) -> None:
+    @staticmethod
+    def _parse_json_mapping(widget: widgets.Textarea) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
-        Настраивает динамическое отображение виджетов в зависимости от выбранных опций.
-        """
-        # Обработчики для динамического отображения виджетов
-        def on_datetime_checkbox_change(change):
-            if change['new']:
-                self.text_time_col.layout.display = 'block'
-                self.dropdown_time_errors.layout.display = 'block'
-                self.cb_infer_datetime_format.layout.display = 'block'
-            else:
-                self.text_time_col.layout.display = 'none'
-                self.dropdown_time_errors.layout.display = 'none'
-                self.cb_infer_datetime_format.layout.display = 'none'
-        
-        def on_missing_checkbox_change(change):
-            if change['new']:
-                self.dropdown_missing_strategy.layout.display = 'block'
-                self.text_missing_subset_cols.layout.display = 'block'
-                
-                # При изменении стратегии также показываем/скрываем связанные виджеты
-                strategy = self.dropdown_missing_strategy.value
-                if strategy == 'fill_constant':
-                    self.text_missing_fill_value.layout.display = 'block'
-                else:
-                    self.text_missing_fill_value.layout.display = 'none'
-                    
-                if strategy == 'interpolate':
-                    self.dropdown_interpolate_method.layout.display = 'block'
-                else:
-                    self.dropdown_interpolate_method.layout.display = 'none'
-            else:
-                self.dropdown_missing_strategy.layout.display = 'none'
-                self.text_missing_fill_value.layout.display = 'none'
-                self.dropdown_interpolate_method.layout.display = 'none'
-                self.text_missing_subset_cols.layout.display = 'none'
-        
-        def on_missing_strategy_change(change):
-            strategy = change['new']
-            if strategy == 'fill_constant':
-                self.text_missing_fill_value.layout.display = 'block'
-            else:
-                self.text_missing_fill_value.layout.display = 'none'
-                
-            if strategy == 'interpolate':
-                self.dropdown_interpolate_method.layout.display = 'block'
-            else:
-                self.dropdown_interpolate_method.layout.display = 'none'
-        
-        def on_convert_types_checkbox_change(change):
-            if change['new']:
-                self.textarea_column_types.layout.display = 'block'
-                self.dropdown_convert_errors.layout.display = 'block'
-            else:
-                self.textarea_column_types.layout.display = 'none'
-                self.dropdown_convert_errors.layout.display = 'none'
-        
-        def on_remove_duplicates_checkbox_change(change):
-            if change['new']:
-                self.dropdown_duplicates_keep.layout.display = 'block'
-                self.text_duplicates_subset.layout.display = 'block'
-            else:
-                self.dropdown_duplicates_keep.layout.display = 'none'
-                self.text_duplicates_subset.layout.display = 'none'
-        
-        def on_rename_columns_checkbox_change(change):
-            if change['new']:
-                self.textarea_rename_map.layout.display = 'block'
-            else:
-                self.textarea_rename_map.layout.display = 'none'
-        
-        def on_select_columns_checkbox_change(change):
-            if change['new']:
-                self.text_columns_to_keep.layout.display = 'block'
-            else:
-                self.text_columns_to_keep.layout.display = 'none'
+        Разбирает JSON-словарь из текстового поля и подсвечивает поле при ошибке.
         
-        # Привязываем обработчики
-        self.cb_set_datetime_index.observe(on_datetime_checkbox_change, names='value')
-        self.cb_handle_missing.observe(on_missing_checkbox_change, names='value')
-        self.dropdown_missing_strategy.observe(on_missing_strategy_change, names='value')
-        self.cb_convert_types.observe(on_convert_types_checkbox_change, names='value')
-        self.cb_remove_duplicates.observe(on_remove_duplicates_checkbox_change, names='value')
-        self.cb_rename_columns.observe(on_rename_columns_checkbox_change, names='value')
-        self.cb_select_columns.observe(on_select_columns_checkbox_change, names='value')
+        Args:
+            widget (widgets.Textarea): Текстовое поле с JSON.
+            
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[str]]: Разобранный словарь (или None)
+                и текст ошибки (или None, если разбор успешен).
+        """
+        try:
+            # orjson.JSONDecodeError является подклассом ValueError
+            value = _json_loads(widget.value)
+            if not isinstance(value, dict):
+                raise ValueError('ожидается JSON-объект вида {"ключ": "значение"}')
+        except ValueError as e:
+            widget.layout.border = '1px solid red'
+            return None, str(e)
+        
+        widget.layout.border = ''
+        return value, None
+    
+    @staticmethod
+    def _split_columns(text: str) -> Optional[List[str]]:
+        """
+        Разбирает список колонок, перечисленных через запятую.
         
-        # Инициализируем скрытие виджетов
-        self.text_time_col.layout.display = 'none'
-        self.dropdown_time_errors.layout.display = 'none'
-        self.cb_infer_datetime_format.layout.display = 'none'
+        Args:
+            text (str): Строка вида 'col1,col2,col3'.
+            
+        Returns:
+            Optional[List[str]]: Список имен колонок или None, если строка пуста.
+        """
+        text = text.strip()
+        return [col.strip() for col in text.split(',')] if text else None
+    
+    def _parse_column_types(self, change: Optional[Dict[str, Any]] = None) -> None:
+        """Обновляет кэш разобранного словаря типов колонок."""
+        self._parsed_column_types, self._column_types_error = self._parse_json_mapping(self.textarea_column_types)
+    
+    def _parse_rename_map(self, change: Optional[Dict[str, Any]] = None) -> None:
+        """Обновляет кэш разобранной карты переименования колонок."""
+        self._parsed_rename_map, self._rename_map_error = self._parse_json_mapping(self.textarea_rename_map)
+    
+    def _parse_missing_subset_cols(self, change: Optional[Dict[str, Any]] = None) -> None:
+        """Обновляет кэш списка колонок для обработки пропусков."""
+        self._missing_subset_cols = self._split_columns(self.text_missing_subset_cols.value)
+    
+    def _parse_duplicates_subset(self, change: Optional[Dict[str, Any]] = None) -> None:
+        """Обновляет кэш списка колонок для определения дубликатов."""
+        self._duplicates_subset = self._split_columns(self.text_duplicates_subset.value)
+    
+    def _parse_columns_to_keep(self, change: Optional[Dict[str, Any]] = None) -> None:
+        """Обновляет кэш списка колонок для сохранения."""
+        self._columns_to_keep = self._split_columns(self.text_columns_to_keep.value)
+    
+    def _setup_dynamic_widgets(self) -> None:
+        """
+        Настраивает динамическое отображение виджетов в зависимости от выбранных опций.
         
-        self.dropdown_missing_strategy.layout.display = 'none'
-        self.text_missing_fill_value.layout.display = 'none'
-        self.dropdown_interpolate_method.layout.display = 'none'
-        self.text_missing_subset_cols.layout.display = 'none'
+        Виджеты, зависящие от флажка, помещаются в общий контейнер, и флажок
+        переключает видимость только этого контейнера: одно изменение layout
+        вместо отдельного изменения для каждого виджета. Для выпадающих списков
+        задаются виджеты, видимые при определенном значении.
         
-        self.textarea_column_types.layout.display = 'none'
-        self.dropdown_convert_errors.layout.display = 'none'
+        Note:
+            widgets.jsdlink не поддерживает преобразование значений, поэтому связать
+            булево значение флажка со строковым свойством layout.display на стороне
+            браузера нельзя, и видимость по-прежнему переключается обработчиком в Python.
+        """
+        # Контейнеры с виджетами, которые отображаются только при включенном флажке
+        self._cb_groups = {
+            self.cb_set_datetime_index: widgets.VBox([
+                self.text_time_col,
+                self.dropdown_time_errors,
+                self.cb_infer_datetime_format,
+                self.text_datetime_format
+            ]),
+            self.cb_handle_missing: widgets.VBox([
+                self.dropdown_missing_strategy,
+                self.text_missing_fill_value,
+                self.dropdown_interpolate_method,
+                self.text_missing_subset_cols
+            ]),
+            self.cb_convert_types: widgets.VBox([self.textarea_column_types, self.dropdown_convert_errors]),
+            self.cb_remove_duplicates: widgets.VBox([self.dropdown_duplicates_keep, self.text_duplicates_subset]),
+            self.cb_rename_columns: widgets.VBox([self.textarea_rename_map]),
+            self.cb_select_columns: widgets.VBox([self.text_columns_to_keep]),
+        }
+        
+        # Виджеты, которые отображаются только при определенном значении выпадающего списка.
+        # Если выпадающий список находится в скрытом контейнере, его зависимые виджеты
+        # скрываются вместе с контейнером
+        self._dropdown_groups = {
+            self.dropdown_missing_strategy: {
+                'fill_constant': [self.text_missing_fill_value],
+                'interpolate': [self.dropdown_interpolate_method],
+            },
+            self.dropdown_save_format: {
+                # Настройка сжатия применяется только к формату parquet
+                'parquet': [self.dropdown_save_compression],
+            },
+        }
+        
+        # Привязываем общие обработчики
+        for checkbox in self._cb_groups:
+            checkbox.observe(self._on_cb, names='value')
+        for dropdown in self._dropdown_groups:
+            dropdown.observe(self._on_dropdown, names='value')
+        
+        # Инициализируем видимость виджетов по текущим значениям
+        for checkbox in self._cb_groups:
+            self._update_cb_group(checkbox)
+        for dropdown in self._dropdown_groups:
+            self._update_dropdown_group(dropdown)
+    
+    @staticmethod
+    def _set_visible(widget_list: List[widgets.Widget], visible: bool) -> None:
+        """
+        Показывает или скрывает виджеты.
         
-        self.dropdown_duplicates_keep.layout.display = 'none'
-        self.text_duplicates_subset.layout.display = 'none'
+        Args:
+            widget_list (List[widgets.Widget]): Список виджетов.
+            visible (bool): True - показать виджеты, False - скрыть.
+        """
+        display_value = '' if visible else 'none'
+        for widget in widget_list:
+            if widget.layout.display != display_value:
+                widget.layout.display = display_value
+    
+    def _update_cb_group(self, checkbox: widgets.Checkbox) -> None:
+        """
+        Обновляет видимость контейнера с виджетами, зависящими от флажка.
         
-        self.textarea_rename_map.layout.display = 'none'
+        Args:
+            checkbox (widgets.Checkbox): Флажок из self._cb_groups.
+        """
+        self._set_visible([self._cb_groups[checkbox]], checkbox.value)
+    
+    def _update_dropdown_group(self, dropdown: widgets.Dropdown) -> None:
+        """
+        Обновляет видимость виджетов, зависящих от значения выпадающего списка.
         
-        self.text_columns_to_keep.layout.display = 'none'
+        Args:
+            dropdown (widgets.Dropdown): Выпадающий список из self._dropdown_groups.
+        """
+        for value, children in self._dropdown_groups[dropdown].items():
+            self._set_visible(children, dropdown.value == value)
+    
+    def _on_cb(self, change: Dict[str, Any]) -> None:
+        """Общий обработчик изменения флажков, управляющих видимостью виджетов."""
+        self._update_cb_group(change['owner'])
+    
+    def _on_dropdown(self, change: Dict[str, Any]) -> None:
+        """Общий обработчик изменения выпадающих списков, управляющих видимостью виджетов."""
+        self._update_dropdown_group(change['owner'])
         
     def _on_process_button_clicked(self, b: widgets.Button) -> None:
         """
@@ -348,40 +527,58 @@ class DataProcessorUI:
             b (widgets.Button): Объект кнопки, вызвавшей обработчик.
         """
         # Очищаем область вывода
-        self.log_output.clear_output()
+        self._clear_log()
         self.processed_df_preview_output.clear_output()
         
-        with self.log_output:
-            print("Начинаю обработку данных...")
+        # Сообщения DataFrameProcessor (logging) перенаправляются в буфер лога
+        with _capture_processor_log(self._log):
+            self._log("Начинаю обработку данных...")
             
-            # Создаем новый экземпляр обработчика с копией исходных данных
-            self.processor = DataFrameProcessor(self.raw_df.copy())
+            # Создаем новый экземпляр обработчика. Исходный self.raw_df не копируется:
+            # DataFrameProcessor копирует данные только при их изменении
+            self.processor = DataFrameProcessor(self.raw_df)
             
-            # --- Установка временного индекса ---
-            if self.cb_set_datetime_index.value:
-                print("\n--- Установка временного индекса ---")
-                time_col = self.text_time_col.value.strip()
-                errors = self.dropdown_time_errors.value
-                infer_datetime_format = self.cb_infer_datetime_format.value
-                
+            # --- Оптимизация типов данных ---
+            # Выполняется первой, чтобы остальные шаги работали с более компактными данными
+            if self.cb_shrink_dtypes.value:
+                self._log("\n--- Оптимизация типов данных ---")
                 try:
-                    self.processor.set_datetime_index(
-                        time_col=time_col,
-                        errors=errors,
-                        infer_datetime_format=infer_datetime_format
-                    )
+                    self.processor.shrink_dtypes()
                 except Exception as e:
-                    print(f"Ошибка при установке временного индекса: {str(e)}")
+                    self._log(f"Ошибка при оптимизации типов данных: {str(e)}")
+            
+            # --- Строки в формате Arrow ---
+            if self.cb_arrow_strings.value:
+                self._log("\n--- Преобразование строк в формат Arrow ---")
+                try:
+                    self.processor.convert_strings_to_arrow()
+                except Exception as e:
+                    self._log(f"Ошибка при преобразовании строк в формат Arrow: {str(e)}")
+            
+            # Шаги обработки собираются в список и выполняются одним вызовом apply_pipeline:
+            # идущие подряд поколоночные шаги (пропуски, типы, переименование, выбор колонок)
+            # выполняются за один проход по колонкам вместо отдельного прохода на каждый шаг.
+            # Колонки, не найденные в DataFrame, исключаются из списков (с выводом в лог),
+            # а ошибка одного шага не прерывает выполнение остальных.
+            steps = []
+            
+            # --- Установка временного индекса ---
+            if self.cb_set_datetime_index.value:
+                steps.append({
+                    'op': 'set_datetime_index',
+                    'title': 'Установка временного индекса',
+                    'params': {
+                        'time_col': self.text_time_col.value.strip(),
+                        'errors': self.dropdown_time_errors.value,
+                        'infer_datetime_format': self.cb_infer_datetime_format.value,
+                        'format': self.text_datetime_format.value.strip() or None
+                    }
+                })
             
             # --- Обработка пропусков ---
             if self.cb_handle_missing.value:
-                print("\n--- Обработка пропущенных значений ---")
                 strategy = self.dropdown_missing_strategy.value
                 
-                # Обрабатываем список колонок
-                subset_cols_text = self.text_missing_subset_cols.value.strip()
-                subset_cols = [col.strip() for col in subset_cols_text.split(',')] if subset_cols_text else None
-                
                 # Для стратегии fill_constant получаем значение
                 fill_value = None
                 if strategy == 'fill_constant':
@@ -402,108 +599,191 @@ class DataProcessorUI:
                 if strategy == 'interpolate':
                     method = self.dropdown_interpolate_method.value
                 
-                try:
-                    self.processor.handle_missing_values(
-                        strategy=strategy,
-                        subset_cols=subset_cols,
-                        fill_value=fill_value,
-                        method=method
-                    )
-                except Exception as e:
-                    print(f"Ошибка при обработке пропущенных значений: {str(e)}")
+                steps.append({
+                    'op': 'handle_missing_values',
+                    'title': 'Обработка пропущенных значений',
+                    'params': {
+                        'strategy': strategy,
+                        'subset_cols': self._missing_subset_cols,
+                        'fill_value': fill_value,
+                        'method': method
+                    }
+                })
             
             # --- Преобразование типов данных ---
             if self.cb_convert_types.value:
-                print("\n--- Преобразование типов данных ---")
-                try:
-                    column_types = json.loads(self.textarea_column_types.value)
-                    errors = self.dropdown_convert_errors.value
-                    
-                    self.processor.convert_data_types(
-                        column_types=column_types,
-                        errors=errors
-                    )
-                except json.JSONDecodeError as e:
-                    print(f"Ошибка в формате JSON для типов колонок: {str(e)}")
-                except Exception as e:
-                    print(f"Ошибка при преобразовании типов данных: {str(e)}")
+                if self._column_types_error:
+                    self._log("\n--- Преобразование типов данных ---")
+                    self._log(f"Ошибка в формате JSON для типов колонок: {self._column_types_error}")
+                else:
+                    steps.append({
+                        'op': 'convert_data_types',
+                        'title': 'Преобразование типов данных',
+                        'params': {
+                            'column_types': self._parsed_column_types,
+                            'errors': self.dropdown_convert_errors.value,
+                            # При уменьшении типов результат преобразования тоже компактный:
+                            # ширина int/float выбирается по значениям колонки
+                            'compact': self.cb_shrink_dtypes.value
+                        }
+                    })
                     
             # --- Удаление дубликатов ---
             if self.cb_remove_duplicates.value:
-                print("\n--- Удаление дубликатов строк ---")
-                # Обрабатываем список колонок для определения дубликатов
-                subset_text = self.text_duplicates_subset.value.strip()
-                subset = [col.strip() for col in subset_text.split(',')] if subset_text else None
-                
-                keep = self.dropdown_duplicates_keep.value
-                
-                try:
-                    self.processor.remove_duplicate_rows(
-                        subset=subset,
-                        keep=keep
-                    )
-                except Exception as e:
-                    print(f"Ошибка при удалении дубликатов: {str(e)}")
+                steps.append({
+                    'op': 'remove_duplicate_rows',
+                    'title': 'Удаление дубликатов строк',
+                    'params': {
+                        'subset': self._duplicates_subset,
+                        'keep': self.dropdown_duplicates_keep.value
+                    }
+                })
             
             # --- Переименование колонок ---
             if self.cb_rename_columns.value:
-                print("\n--- Переименование колонок ---")
-                try:
-                    rename_map = json.loads(self.textarea_rename_map.value)
-                    self.processor.rename_columns(rename_map=rename_map)
-                except json.JSONDecodeError as e:
-                    print(f"Ошибка в формате JSON для переименования колонок: {str(e)}")
-                except Exception as e:
-                    print(f"Ошибка при переименовании колонок: {str(e)}")
+                if self._rename_map_error:
+                    self._log("\n--- Переименование колонок ---")
+                    self._log(f"Ошибка в формате JSON для переименования колонок: {self._rename_map_error}")
+                else:
+                    steps.append({
+                        'op': 'rename_columns',
+                        'title': 'Переименование колонок',
+                        'params': {'rename_map': self._parsed_rename_map}
+                    })
             
             # --- Выбор колонок ---
             if self.cb_select_columns.value:
-                print("\n--- Выбор колонок ---")
-                # Обрабатываем список колонок для сохранения
-                columns_text = self.text_columns_to_keep.value.strip()
-                if columns_text:
-                    columns_to_keep = [col.strip() for col in columns_text.split(',')]
-                    try:
-                        self.processor.select_columns(columns_to_keep=columns_to_keep)
-                    except Exception as e:
-                        print(f"Ошибка при выборе колонок: {str(e)}")
+                if self._columns_to_keep:
+                    steps.append({
+                        'op': 'select_columns',
+                        'title': 'Выбор колонок',
+                        'params': {'columns_to_keep': self._columns_to_keep}
+                    })
                 else:
-                    print("Не указаны колонки для сохранения. Пропускаю этот шаг.")
+                    self._log("\n--- Выбор колонок ---")
+                    self._log("Не указаны колонки для сохранения. Пропускаю этот шаг.")
             
-            # Получаем обработанный DataFrame
-            self.processed_df = self.processor.get_processed_df()
+            try:
+                self.processor.apply_pipeline(steps, stop_on_error=False, ignore_missing_columns=True)
+            except Exception as e:
+                self._log(f"Ошибка при выполнении обработки: {str(e)}")
+            
+            # Получаем обработанный DataFrame. Копия не нужна: при следующей обработке
+            # создается новый DataFrameProcessor, и рабочий DataFrame больше не меняется
+            self.processed_df = self.processor.get_processed_df(copy=False)
             
             # --- Сохранение DataFrame ---
-            print("\n--- Сохранение обработанного DataFrame ---")
+            self._log("\n--- Сохранение обработанного DataFrame ---")
             filename_prefix = self.text_save_filename_prefix.value.strip()
             file_format = self.dropdown_save_format.value
             include_timestamp = self.cb_include_timestamp.value
+            compression = self.dropdown_save_compression.value
             
-            try:
-                file_path = self.drive_saver.save_dataframe(
-                    df=self.processed_df,
-                    filename_prefix=filename_prefix,
-                    file_format=file_format,
-                    include_timestamp=include_timestamp
-                )
-                if file_path:
-                    print(f"DataFrame успешно сохранен: {file_path}")
-            except Exception as e:
-                print(f"Ошибка при сохранении DataFrame: {str(e)}")
+            # Запись на Google Drive выполняется в фоновом потоке, чтобы UI
+            # стал доступен сразу после завершения обработки в памяти. Сообщения
+            # DriveIOHandler (в том числе причина ошибки) передаются в лог UI,
+            # а не в stdout фонового потока
+            future = self._io_pool.submit(
+                self.drive_saver.save_dataframe,
+                df=self.processed_df,
+                filename_prefix=filename_prefix,
+                file_format=file_format,
+                include_timestamp=include_timestamp,
+                compression=compression,
+                use_dictionary=True,
+                log_func=self._log
+            )
+            self._log("Сохранение выполняется в фоновом режиме...")
             
-            print("\nОбработка данных завершена!")
+            self._log("\nОбработка данных завершена!")
+        
+        self._flush_log()
+        future.add_done_callback(self._log_saved)
         
         # Отображаем результат в области предпросмотра
         with self.processed_df_preview_output:
             if self.processed_df is not None:
                 print("Обработанный DataFrame:")
-                display(HTML("<h4>Сводная информация</h4>"))
-                self.processed_df.info()
-                display(HTML("<h4>Первые 5 строк</h4>"))
-                display(self.processed_df.head())
+                self._display_dataframe_summary(self.processed_df)
             else:
                 print("Обработка данных не выполнена или завершилась с ошибкой.")
         
+    @staticmethod
+    def _display_dataframe_summary(df: pd.DataFrame) -> None:
+        """
+        Выводит сводную информацию и первые строки DataFrame.
+        
+        Для больших DataFrame подсчет непустых значений в df.info() пропускается,
+        а предпросмотр выводится готовой HTML-таблицей с ограниченным числом колонок,
+        чтобы не блокировать вывод в Colab.
+        
+        Args:
+            df (pd.DataFrame): DataFrame для отображения.
+        """
+        display(HTML("<h4>Сводная информация</h4>"))
+        df.info(show_counts=len(df) <= _INFO_COUNTS_MAX_ROWS)
+        display(HTML("<h4>Первые 5 строк</h4>"))
+        # HTML формируется один раз с ограничением по колонкам: для широких
+        # DataFrame это заметно уменьшает объем разметки, передаваемой в Colab
+        preview_html = df.head().to_html(
+            max_rows=5,
+            max_cols=_PREVIEW_MAX_COLUMNS,
+            show_dimensions=True,
+            notebook=True
+        )
+        display(HTML(preview_html))
+        
+    def _log_saved(self, future: Future) -> None:
+        """
+        Выводит в лог результат фонового сохранения DataFrame.
+        
+        Args:
+            future (Future): Результат задачи DriveIOHandler.save_dataframe.
+        """
+        try:
+            file_path = future.result()
+        except Exception as e:
+            message = f"Ошибка при сохранении DataFrame: {str(e)}"
+        else:
+            if file_path:
+                message = f"DataFrame успешно сохранен: {file_path}"
+            else:
+                # Причина ошибки уже выведена в лог через log_func
+                message = "Не удалось сохранить DataFrame"
+        
+        # Вызывается из фонового потока; буфер лога защищен блокировкой
+        self._log(message)
+        self._flush_log()
+    
+    def _log(self, message: str) -> None:
+        """
+        Добавляет строку в буфер лога обработки.
+        
+        Виджет лога обновляется, только если с предыдущего обновления прошло
+        не меньше _LOG_FLUSH_INTERVAL секунд; оставшиеся строки выводятся
+        вызовом _flush_log().
+        
+        Args:
+            message (str): Текст сообщения.
+        """
+        with self._log_lock:
+            self._log_buf.append(message)
+        if time.monotonic() - self._last_log_flush >= _LOG_FLUSH_INTERVAL:
+            self._flush_log()
+    
+    def _flush_log(self) -> None:
+        """Выводит содержимое буфера лога в виджет одним обновлением."""
+        with self._log_lock:
+            text = '\n'.join(self._log_buf)
+            self._last_log_flush = time.monotonic()
+            self.log_view.value = f"<pre style='margin: 0'>{html.escape(text)}</pre>"
+    
+    def _clear_log(self) -> None:
+        """Очищает лог обработки."""
+        with self._log_lock:
+            self._log_buf = []
+        self._flush_log()
+        
     def display(self) -> None:
         """
         Отображает UI в ячейке Jupyter/Colab ноутбука.
@@ -511,10 +791,7 @@ class DataProcessorUI:
         # Отображаем информацию о исходном DataFrame
         with self.df_info_output:
             display(HTML("<h3>Исходный DataFrame</h3>"))
-            display(HTML("<h4>Сводная информация</h4>"))
-            self.raw_df.info()
-            display(HTML("<h4>Первые 5 строк</h4>"))
-            display(self.raw_df.head())
+            self._display_dataframe_summary(self.raw_df)
         
         # Создаем структуру UI
         
@@ -527,44 +804,37 @@ class DataProcessorUI:
         # --- Блок настроек индекса времени
         datetime_index_block = widgets.VBox([
             self.cb_set_datetime_index,
-            self.text_time_col,
-            self.dropdown_time_errors,
-            self.cb_infer_datetime_format
+            self._cb_groups[self.cb_set_datetime_index]
         ], layout={'border': '1px solid #ddd', 'padding': '10px', 'margin': '5px'})
         
         # --- Блок настроек обработки пропусков
         missing_values_block = widgets.VBox([
             self.cb_handle_missing,
-            self.dropdown_missing_strategy,
-            self.text_missing_fill_value,
-            self.dropdown_interpolate_method,
-            self.text_missing_subset_cols
+            self._cb_groups[self.cb_handle_missing]
         ], layout={'border': '1px solid #ddd', 'padding': '10px', 'margin': '5px'})
         
         # --- Блок настроек преобразования типов
         convert_types_block = widgets.VBox([
             self.cb_convert_types,
-            self.textarea_column_types,
-            self.dropdown_convert_errors
+            self._cb_groups[self.cb_convert_types]
         ], layout={'border': '1px solid #ddd', 'padding': '10px', 'margin': '5px'})
         
         # --- Блок настроек удаления дубликатов
         duplicates_block = widgets.VBox([
             self.cb_remove_duplicates,
-            self.dropdown_duplicates_keep,
-            self.text_duplicates_subset
+            self._cb_groups[self.cb_remove_duplicates]
         ], layout={'border': '1px solid #ddd', 'padding': '10px', 'margin': '5px'})
         
         # --- Блок настроек переименования колонок
         rename_block = widgets.VBox([
             self.cb_rename_columns,
-            self.textarea_rename_map
+            self._cb_groups[self.cb_rename_columns]
         ], layout={'border': '1px solid #ddd', 'padding': '10px', 'margin': '5px'})
         
         # --- Блок настроек выбора колонок
         select_columns_block = widgets.VBox([
             self.cb_select_columns,
-            self.text_columns_to_keep
+            self._cb_groups[self.cb_select_columns]
         ], layout={'border': '1px solid #ddd', 'padding': '10px', 'margin': '5px'})
         
         # --- Блок настроек сохранения
@@ -572,9 +842,17 @@ class DataProcessorUI:
             widgets.HTML("<h4>Параметры сохранения</h4>"),
             self.text_save_filename_prefix,
             self.dropdown_save_format,
+            self.dropdown_save_compression,
             self.cb_include_timestamp
         ], layout={'border': '1px solid #ddd', 'padding': '10px', 'margin': '5px'})
         
+        # --- Блок настроек оптимизации памяти
+        memory_block = widgets.VBox([
+            widgets.HTML("<h4>Оптимизация памяти</h4>"),
+            self.cb_shrink_dtypes,
+            self.cb_arrow_strings
+        ], layout={'border': '1px solid #ddd', 'padding': '10px', 'margin': '5px'})
+        
         # --- Кнопка обработки
         button_block = widgets.HBox([
             self.process_button
@@ -615,7 +893,7 @@ class DataProcessorUI:
         main_container = widgets.VBox([
             info_block,
             processing_block,
-            save_block,
+            widgets.HBox([save_block, memory_block]),
             button_block,
             output_block
         ])
@@ -10,6 +10,108 @@ import pandas as pd
 import numpy as np
 from typing import Optional, List, Dict, Any, Callable, Union
 import json
+import importlib.util
+import logging
+
+
+# Сообщения о выполненных операциях выводятся через logging на уровне INFO.
+# При уровне по умолчанию (WARNING) они не выводятся и почти ничего не стоят;
+# чтобы видеть их в ноутбуке, достаточно logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Основная версия pandas: определяет поддержку режима Copy-on-Write
+_PANDAS_MAJOR = int(pd.__version__.split('.')[0])
+
+
+def _enable_copy_on_write() -> bool:
+    """
+    Включает режим Copy-on-Write (CoW) в pandas, если он поддерживается.
+    
+    В режиме CoW DataFrame, созданные из одного источника, разделяют данные,
+    пока один из них не будет изменен, поэтому полная копия исходных данных
+    перед обработкой не требуется.
+    
+    Returns:
+        bool: True, если режим Copy-on-Write активен.
+    """
+    if _PANDAS_MAJOR >= 3:
+        # В pandas >= 3.0 CoW включен всегда, а опция объявлена устаревшей
+        return True
+    if _PANDAS_MAJOR < 2:
+        return False
+    pd.set_option('mode.copy_on_write', True)
+    return True
+
+
+def _copy_on_write_active() -> bool:
+    """
+    Проверяет, активен ли режим Copy-on-Write в данный момент.
+    
+    Пользователь может отключить опцию mode.copy_on_write после импорта
+    фреймворка, поэтому проверяется текущее значение опции.
+    
+    Returns:
+        bool: True, если режим Copy-on-Write активен.
+    """
+    if _PANDAS_MAJOR >= 3:
+        return True
+    if _PANDAS_MAJOR < 2:
+        return False
+    # В pandas 2.2 опция может иметь значение 'warn', при котором CoW не действует
+    return pd.get_option('mode.copy_on_write') is True
+
+
+# Включаем Copy-on-Write один раз при импорте фреймворка
+_enable_copy_on_write()
+
+# Операции DataFrameProcessor, доступные в apply_pipeline
+_PIPELINE_OPS = (
+    'set_datetime_index', 'handle_missing_values', 'convert_data_types',
+    'remove_duplicate_rows', 'rename_columns', 'select_columns'
+)
+
+# Стратегии обработки пропусков, которые применяются к каждой колонке независимо
+# и поэтому могут быть объединены с другими поколоночными шагами в apply_pipeline
+_FUSABLE_MISSING_STRATEGIES = ('ffill', 'bfill', 'fill_constant', 'fill_mean', 'fill_median', 'fill_zero')
+
+# Параметры операций, содержащие списки колонок или словари с именами колонок
+# в качестве ключей (для apply_pipeline с ignore_missing_columns=True)
+_COLUMN_LIST_PARAMS = {
+    'handle_missing_values': 'subset_cols',
+    'convert_data_types': 'column_types',
+    'remove_duplicate_rows': 'subset',
+    'rename_columns': 'rename_map',
+    'select_columns': 'columns_to_keep',
+}
+
+# Директивы формата, при которых разбор дат выполняется pandas, а не pyarrow.compute.strptime
+_ARROW_UNSUPPORTED_DIRECTIVES = ('%z', '%Z', '%f')
+
+# Минимальное число строк, начиная с которого линейная интерполяция выполняется
+# в Polars (если пакет установлен): для меньших DataFrame преобразование
+# pandas -> Polars -> pandas занимает больше времени, чем сама интерполяция
+_POLARS_MIN_ROWS = 100_000
+
+# Соответствие пользовательских имен типов типам pandas для convert_data_types
+_DTYPE_ALIASES = {
+    'float': float,
+    'int': int,
+    'str': str,
+    'category': 'category',
+    'cat': 'category',
+    'bool': bool,
+}
+
+# Компактные типы для convert_data_types(compact=True). Колонки 'int' и 'float'
+# сначала приводятся к 64-битным типам, а затем уменьшаются до наименьшего типа,
+# в который помещаются их значения (см. _downcast_compact)
+_COMPACT_DTYPE_ALIASES = {
+    **_DTYPE_ALIASES,
+    'str': 'string[pyarrow]' if importlib.util.find_spec('pyarrow') is not None else 'string',
+}
+
+# Режим pd.to_numeric(downcast=...) для компактных числовых типов
+_COMPACT_DOWNCAST = {'int': 'integer', 'float': 'float'}
 
 
 class DataFrameProcessor:
@@ -17,31 +119,202 @@ class DataFrameProcessor:
     Класс для обработки DataFrame. Предоставляет методы для различных
     операций предобработки данных, таких как обработка пропусков,
     установка временного индекса, преобразование типов данных и пр.
+    
+    Note:
+        Рабочий DataFrame self.df создается без копирования данных и разделяет
+        массивы столбцов с исходным DataFrame. При Copy-on-Write pandas копирует
+        данные только при их изменении. Без CoW (pandas < 2.0) методы, изменяющие
+        self.df на месте, должны предварительно вызвать _ensure_owned(), чтобы
+        не изменить исходный DataFrame вызывающего кода.
     """
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, verbose_stats: bool = False, keep_log: bool = True):
         """
         Инициализирует обработчик DataFrame.
         
         Args:
             df (pd.DataFrame): Исходный "сырой" DataFrame для обработки.
+            verbose_stats (bool, optional): Подсчитывать и логировать дополнительную
+                статистику операций: число пропусков до и после handle_missing_values,
+                изменения типов и состава колонок в apply_custom_function. Подсчет
+                требует отдельных проходов по данным.
+                По умолчанию False.
+            keep_log (bool, optional): Сохранять ли сообщения в log_messages
+                (см. get_log_messages). По умолчанию True.
         """
-        # Создание рабочей копии DataFrame
-        self.df = df.copy()
+        # Поверхностная копия: новый объект DataFrame с общими данными столбцов.
+        # Полная копия создается только при необходимости (см. _ensure_owned)
+        self.df = df.copy(deep=False)
+        self._owns_data = False
+        self._verbose_stats = verbose_stats
+        self._keep_log = keep_log
         self.log_messages = []
-        self._log(f"Создана копия исходного DataFrame с размером {self.df.shape}")
+        self._log(f"Создан рабочий DataFrame размером {self.df.shape}")
+        self._make_columns_contiguous()
+    
+    def set_verbose(self, verbose_stats: bool = True) -> None:
+        """
+        Включает или отключает подсчет дополнительной статистики операций.
+        
+        Args:
+            verbose_stats (bool, optional): Новое значение флага (см. __init__).
+                По умолчанию True.
+        """
+        self._verbose_stats = verbose_stats
+    
+    def _ensure_owned(self) -> None:
+        """
+        Создает собственную копию данных перед изменением self.df на месте.
+        
+        При Copy-on-Write ничего не делает: pandas сам скопирует изменяемые блоки.
+        Без CoW полная копия создается один раз, при первом изменении на месте.
+        Режим проверяется при каждом вызове, так как CoW может быть отключен
+        после создания обработчика.
+        """
+        if not self._owns_data and not _copy_on_write_active():
+            self.df = self.df.copy()
+            self._owns_data = True
+    
+    def _make_columns_contiguous(self) -> None:
+        """
+        Размещает значения каждой числовой колонки в непрерывном участке памяти.
+        
+        DataFrame, созданный из двумерного массива NumPy в построчном (C) порядке,
+        хранит значения колонки с шагом в целую строку. Агрегации и заполнение
+        пропусков по колонкам (mean, median, ffill, isna().sum()) при этом читают
+        память вразброс и работают в несколько раз медленнее. Такие колонки
+        копируются в непрерывные массивы один раз при создании обработчика;
+        если все колонки уже непрерывны, DataFrame не изменяется.
+        """
+        strided = [
+            i for i, (_, series) in enumerate(self.df.items())
+            if isinstance(series.dtype, np.dtype) and not series.values.flags['C_CONTIGUOUS']
+        ]
+        if not strided:
+            return
+        
+        strided_set = set(strided)
+        columns = {
+            i: np.ascontiguousarray(series.values) if i in strided_set else series
+            for i, (_, series) in enumerate(self.df.items())
+        }
+        result = pd.DataFrame(columns, index=self.df.index, copy=False)
+        result.columns = self.df.columns
+        self.df = result
+        self._log(f"Значения {len(strided)} колонок скопированы в непрерывные массивы")
     
     def _log(self, message: str) -> None:
         """
         Приватный метод для логирования операций.
         
+        Сообщение передается в logger модуля на уровне INFO и, если включен
+        keep_log, сохраняется в log_messages.
+        
         Args:
             message (str): Сообщение для логирования.
         """
-        print(message)
-        self.log_messages.append(message)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(message)
+        if self._keep_log:
+            self.log_messages.append(message)
     
-    def set_datetime_index(self, time_col: str, errors: str = 'raise', infer_datetime_format: bool = True) -> None:
+    @staticmethod
+    def _parse_arrow_datetimes(series: pd.Series, format: str, errors: str) -> Optional[pd.Series]:
+        """
+        Разбирает строковую колонку в формате Arrow в datetime средствами PyArrow.
+        
+        Для колонок string[pyarrow] разбор выполняется вычислительным ядром Arrow
+        (pyarrow.compute.strptime) без преобразования значений в Python-объекты.
+        
+        Args:
+            series (pd.Series): Колонка со строковыми представлениями даты/времени.
+            format (str): Формат даты/времени в нотации strftime.
+            errors (str): Как обрабатывать ошибки: 'raise' или 'coerce'.
+            
+        Returns:
+            Optional[pd.Series]: Колонка типа datetime64[ns] или None, если быстрый путь
+                неприменим (колонка не в формате Arrow, pyarrow не установлен, формат или
+                значения не поддерживаются Arrow, формат содержит часовой пояс или доли секунды).
+                В этом случае следует использовать pd.to_datetime.
+        """
+        if errors not in ('raise', 'coerce'):
+            return None
+        
+        # strptime Arrow приводит время со смещением к UTC и теряет зону, а директиву %f
+        # не поддерживает (при errors='coerce' все значения стали бы NaT)
+        if any(directive in format for directive in _ARROW_UNSUPPORTED_DIRECTIVES):
+            return None
+        
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            return None
+        
+        dtype = series.dtype
+        arrow_dtype_cls = getattr(pd, 'ArrowDtype', None)
+        if isinstance(dtype, pd.StringDtype):
+            is_arrow_string = dtype.storage.startswith('pyarrow')
+        elif arrow_dtype_cls is not None and isinstance(dtype, arrow_dtype_cls):
+            is_arrow_string = pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+        else:
+            is_arrow_string = False
+        
+        if not is_arrow_string:
+            return None
+        
+        try:
+            values = pa.array(series)
+            parsed = pc.strptime(values, format=format, unit='ns', error_is_null=(errors == 'coerce'))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            # Значения или формат не поддерживаются Arrow - используем pandas
+            return None
+        
+        # Нераспознанные значения при errors='coerce' Arrow молча заменяет на null:
+        # такие значения разбираем средствами pandas, который может их распознать
+        if parsed.null_count > values.null_count:
+            return None
+        
+        # Series строится из значений: parsed.to_pandas() возвращает Series с RangeIndex,
+        # и передача ее в pd.Series(..., index=...) выровняла бы значения по меткам индекса
+        return pd.Series(parsed.to_numpy(zero_copy_only=False), index=series.index, name=series.name)
+    
+    @staticmethod
+    def _guess_datetime_format(series: pd.Series) -> Optional[str]:
+        """
+        Определяет формат даты/времени по первому непустому значению строковой колонки.
+        
+        Args:
+            series (pd.Series): Колонка с датами/временем.
+            
+        Returns:
+            Optional[str]: Формат в нотации strftime или None, если колонка не строковая,
+                не содержит значений или формат определить не удалось.
+        """
+        if pd.api.types.is_datetime64_any_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            return None
+        
+        not_na = series.notna().to_numpy()
+        if not not_na.any():
+            return None
+        sample = series.iloc[int(not_na.argmax())]
+        if not isinstance(sample, str):
+            return None
+        
+        try:
+            from pandas.tseries.api import guess_datetime_format
+        except ImportError:
+            # pandas < 2.2
+            from pandas._libs.tslibs.parsing import guess_datetime_format
+        return guess_datetime_format(sample)
+    
+    def set_datetime_index(
+            self, 
+            time_col: str, 
+            errors: str = 'raise', 
+            infer_datetime_format: bool = True,
+            format: Optional[str] = None
+        ) -> None:
         """
         Преобразует указанный столбец в datetime и устанавливает его в качестве индекса.
         
@@ -49,8 +322,14 @@ class DataFrameProcessor:
             time_col (str): Имя столбца для преобразования в datetime.
             errors (str, optional): Как обрабатывать ошибки при преобразовании. По умолчанию 'raise'.
                 'raise' - вызывать исключение, 'coerce' - устанавливать NaT для ошибочных значений.
-            infer_datetime_format (bool, optional): Пытаться ли вывести формат даты/времени из строк.
-                По умолчанию True.
+            infer_datetime_format (bool, optional): Определять ли формат даты/времени по первому
+                непустому значению строковой колонки (pandas guess_datetime_format). Найденный
+                формат используется для разбора всей колонки; если разбор с ним не удался,
+                pandas определяет формат самостоятельно. По умолчанию True.
+                Не используется, если задан format.
+            format (str, optional): Формат даты/времени в нотации strftime, например
+                '%Y-%m-%d %H:%M:%S'. Явный формат позволяет pandas разбирать строки
+                векторизованно, без определения формата для каждого значения. По умолчанию None.
         
         Raises:
             KeyError: Если столбец time_col не найден в DataFrame.
@@ -63,12 +342,36 @@ class DataFrameProcessor:
             # Сохраняем изначальный размер данных для отчета
             orig_shape = self.df.shape
             
-            # Конвертируем столбец в datetime
-            self.df[time_col] = pd.to_datetime(
-                self.df[time_col], 
-                errors=errors, 
-                infer_datetime_format=infer_datetime_format
+            # Формат, определенный по одному значению, позволяет разбирать колонку
+            # векторизованно, без определения формата для каждого значения
+            guessed_format = None
+            if format is None and infer_datetime_format:
+                guessed_format = self._guess_datetime_format(self.df[time_col])
+                if guessed_format:
+                    self._log(f"Определен формат даты/времени: '{guessed_format}'")
+            parse_format = format or guessed_format
+            
+            # Конвертируем столбец в datetime. cache=True разбирает каждое уникальное
+            # значение один раз, что ускоряет обработку повторяющихся меток времени
+            arrow_parsed = (
+                self._parse_arrow_datetimes(self.df[time_col], parse_format, errors) if parse_format else None
             )
+            self._ensure_owned()
+            if arrow_parsed is not None:
+                self.df[time_col] = arrow_parsed
+            else:
+                try:
+                    self.df[time_col] = pd.to_datetime(
+                        self.df[time_col], 
+                        errors=errors, 
+                        format=parse_format,
+                        cache=True
+                    )
+                except (ValueError, TypeError):
+                    if not guessed_format:
+                        raise
+                    # Формат, определенный по первому значению, подходит не ко всем строкам
+                    self.df[time_col] = pd.to_datetime(self.df[time_col], errors=errors, cache=True)
             
             # Устанавливаем как индекс
             self.df.set_index(time_col, inplace=True)
@@ -83,6 +386,107 @@ class DataFrameProcessor:
             self._log(f"Ошибка при установке datetime индекса: {str(e)}")
             raise
             
+    def shrink_dtypes(self, category_threshold: float = 0.5) -> None:
+        """
+        Уменьшает типы данных колонок до минимально достаточных для экономии памяти.
+        
+        Целочисленные колонки приводятся к наименьшему подходящему int/uint,
+        вещественные - к float32 (с соответствующей потерей точности), а колонки
+        типа object с небольшим числом уникальных значений - к category.
+        
+        Args:
+            category_threshold (float, optional): Максимальная доля уникальных значений
+                в object-колонке, при которой она преобразуется в category. По умолчанию 0.5.
+        """
+        try:
+            memory_before = self.df.memory_usage(deep=True).sum()
+            new_columns = {}
+            
+            # Целочисленные колонки: беззнаковый тип, если нет отрицательных значений.
+            # Для пустой или целиком пропущенной nullable-колонки min() не определен (pd.NA)
+            for col in self.df.select_dtypes(include='integer').columns:
+                series = self.df[col]
+                downcast = 'unsigned' if series.notna().any() and series.min() >= 0 else 'integer'
+                new_columns[col] = pd.to_numeric(series, downcast=downcast)
+            
+            # Вещественные колонки
+            for col in self.df.select_dtypes(include='floating').columns:
+                new_columns[col] = pd.to_numeric(self.df[col], downcast='float')
+            
+            # Строковые колонки с небольшим числом уникальных значений
+            row_count = len(self.df)
+            if row_count:
+                for col in self.df.select_dtypes(include='object').columns:
+                    series = self.df[col]
+                    try:
+                        if series.nunique(dropna=False) / row_count < category_threshold:
+                            new_columns[col] = series.astype('category')
+                    except TypeError:
+                        # Колонки с нехешируемыми значениями (списки, словари) пропускаем
+                        continue
+            
+            # Логируем только реально изменившиеся типы
+            self._ensure_owned()
+            changes = []
+            for col, series in new_columns.items():
+                if series.dtype != self.df[col].dtype:
+                    changes.append(f"'{col}': {self.df[col].dtype} -> {series.dtype}")
+                    self.df[col] = series
+            
+            memory_after = self.df.memory_usage(deep=True).sum()
+            
+            if changes:
+                self._log(f"Уменьшены типы колонок: {', '.join(changes)}")
+            else:
+                self._log("Типы колонок уже оптимальны, изменений нет")
+            self._log(f"Объем памяти: {memory_before / 1024 ** 2:.2f} MB -> {memory_after / 1024 ** 2:.2f} MB")
+            
+        except Exception as e:
+            self._log(f"Ошибка при оптимизации типов данных: {str(e)}")
+            raise
+    
+    def convert_strings_to_arrow(self) -> None:
+        """
+        Преобразует строковые колонки типа object в строковый тип на базе PyArrow.
+        
+        Строки в формате Arrow занимают значительно меньше памяти, чем Python-объекты,
+        а векторные операции .str выполняются вычислительными ядрами Arrow.
+        Преобразуются только колонки, все непустые значения которых являются строками.
+        
+        Note:
+            Пропуски в колонках типа string[pyarrow] представлены как pd.NA, а не NaN/None.
+            Пользовательский код, рассчитывающий на семантику object-колонок, должен это учитывать.
+        
+        Raises:
+            ImportError: Если пакет pyarrow не установлен.
+        """
+        try:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("Для преобразования строк в формат Arrow требуется пакет pyarrow")
+            
+            string_cols = [
+                col for col in self.df.select_dtypes(include='object').columns
+                if pd.api.types.infer_dtype(self.df[col], skipna=True) == 'string'
+            ]
+            
+            if not string_cols:
+                self._log("Строковые колонки типа object не найдены, преобразование не требуется")
+                return
+            
+            memory_before = self.df[string_cols].memory_usage(deep=True).sum()
+            self.df = self.df.astype({col: 'string[pyarrow]' for col in string_cols})
+            memory_after = self.df[string_cols].memory_usage(deep=True).sum()
+            
+            self._log(f"Колонки преобразованы в string[pyarrow]: {string_cols}")
+            self._log(f"Объем памяти этих колонок: {memory_before / 1024 ** 2:.2f} MB -> "
+                      f"{memory_after / 1024 ** 2:.2f} MB")
+            
+        except Exception as e:
+            self._log(f"Ошибка при преобразовании строк в формат Arrow: {str(e)}")
+            raise
+    
     def handle_missing_values(
             self, 
             strategy: str = 'ffill', 
@@ -131,28 +535,28 @@ class DataFrameProcessor:
                 for col in subset_cols:
                     if col not in self.df.columns:
                         raise ValueError(f"Столбец '{col}' не найден в DataFrame")
-                
-                # Создаем временную копию для подсчета пропусков
-                temp_df = self.df[subset_cols] if subset_cols else self.df
-            else:
-                temp_df = self.df
             
-            # Подсчет пропущенных значений перед обработкой
-            missing_before = temp_df.isna().sum().sum()
+            # Подсчет пропущенных значений перед обработкой (только при verbose_stats)
+            missing_before = None
+            if self._verbose_stats:
+                missing_before = self._count_na(self.df[subset_cols] if subset_cols else self.df)
+            
+            # Стратегии с подмножеством колонок изменяют self.df на месте
+            self._ensure_owned()
             
             # Применяем выбранную стратегию
             if strategy == 'ffill':
                 if subset_cols:
-                    self.df[subset_cols] = self.df[subset_cols].fillna(method='ffill')
+                    self.df[subset_cols] = self.df[subset_cols].ffill()
                 else:
-                    self.df = self.df.fillna(method='ffill')
+                    self.df = self.df.ffill()
                 strategy_desc = "заполнение вперед (ffill)"
                 
             elif strategy == 'bfill':
                 if subset_cols:
-                    self.df[subset_cols] = self.df[subset_cols].fillna(method='bfill')
+                    self.df[subset_cols] = self.df[subset_cols].bfill()
                 else:
-                    self.df = self.df.fillna(method='bfill')
+                    self.df = self.df.bfill()
                 strategy_desc = "заполнение назад (bfill)"
                 
             elif strategy == 'dropna_rows':
@@ -166,18 +570,26 @@ class DataFrameProcessor:
             elif strategy == 'dropna_cols':
                 orig_shape = self.df.shape
                 if subset_cols:
-                    # Для subset_cols удаляем только те колонки, в которых есть NaN
-                    cols_to_keep = [col for col in self.df.columns if col not in subset_cols or not self.df[col].isna().any()]
-                    self.df = self.df[cols_to_keep]
+                    # Для subset_cols удаляем только те колонки, в которых есть NaN.
+                    # Наличие пропусков определяется одной редукцией по всем колонкам subset_cols
+                    has_na = self.df[subset_cols].isna().any(axis=0)
+                    cols_with_na = has_na.index[has_na.to_numpy()]
+                    self.df = self.df.loc[:, ~self.df.columns.isin(cols_with_na)]
                 else:
                     self.df = self.df.dropna(axis=1)
                 strategy_desc = f"удаление столбцов с пропусками (удалено {orig_shape[1] - self.df.shape[1]} столбцов)"
                 
             elif strategy == 'interpolate':
-                if subset_cols:
-                    self.df[subset_cols] = self.df[subset_cols].interpolate(method=method)
-                else:
-                    self.df = self.df.interpolate(method=method)
+                # Для линейной интерполяции числовых колонок используется быстрый путь:
+                # Polars для больших DataFrame (если установлен), иначе np.interp
+                float_cols = self._linear_interpolation_columns(subset_cols, method)
+                if float_cols is None:
+                    if subset_cols:
+                        self.df[subset_cols] = self.df[subset_cols].interpolate(method=method)
+                    else:
+                        self.df = self.df.interpolate(method=method)
+                elif float_cols and not self._interpolate_with_polars(float_cols):
+                    self._interpolate_with_numpy(float_cols)
                 strategy_desc = f"интерполяция методом '{method}'"
                 
             elif strategy == 'fill_constant':
@@ -185,59 +597,224 @@ class DataFrameProcessor:
                     raise ValueError("При использовании стратегии 'fill_constant' необходимо указать значение fill_value")
                 
                 if subset_cols:
-                    self.df[subset_cols] = self.df[subset_cols].fillna(fill_value)
+                    # fillna со словарем заполняет колонки на месте в общем вызове,
+                    # без выборки подмножества и обратного присваивания
+                    self.df = self.df.fillna(dict.fromkeys(subset_cols, fill_value))
                 else:
                     self.df = self.df.fillna(fill_value)
                 strategy_desc = f"заполнение константой {fill_value}"
                 
-            elif strategy == 'fill_mean':
-                for col in (subset_cols if subset_cols else self.df.columns):
-                    if pd.api.types.is_numeric_dtype(self.df[col]):
-                        self.df[col] = self.df[col].fillna(self.df[col].mean())
-                strategy_desc = "заполнение средним"
-                
-            elif strategy == 'fill_median':
-                for col in (subset_cols if subset_cols else self.df.columns):
-                    if pd.api.types.is_numeric_dtype(self.df[col]):
-                        self.df[col] = self.df[col].fillna(self.df[col].median())
-                strategy_desc = "заполнение медианой"
+            elif strategy in ('fill_mean', 'fill_median'):
+                # Статистики считаются одним вызовом для всего блока числовых колонок.
+                # fillna с Series заполняет только колонки из ее индекса, каждую своим
+                # значением, поэтому присваивание подмножества колонок не требуется
+                # Числовые колонки определяются по Series типов, без выборки каждой колонки
+                dtypes = self.df.dtypes
+                if subset_cols:
+                    dtypes = dtypes[dtypes.index.isin(subset_cols)]
+                numeric_cols = dtypes.index[[pd.api.types.is_numeric_dtype(dtype) for dtype in dtypes]]
+                if len(numeric_cols):
+                    numeric_df = self.df[numeric_cols]
+                    stats = numeric_df.mean() if strategy == 'fill_mean' else numeric_df.median()
+                    if self.df.columns.is_unique:
+                        self.df = self.df.fillna(stats)
+                    else:
+                        # При повторяющихся именах колонок сопоставление по имени неоднозначно
+                        self.df[numeric_cols] = numeric_df.fillna(stats)
+                strategy_desc = "заполнение средним" if strategy == 'fill_mean' else "заполнение медианой"
                 
             elif strategy == 'fill_zero':
                 if subset_cols:
-                    self.df[subset_cols] = self.df[subset_cols].fillna(0)
+                    self.df = self.df.fillna(dict.fromkeys(subset_cols, 0))
                 else:
                     self.df = self.df.fillna(0)
                 strategy_desc = "заполнение нулями"
             
+            # Логирование результатов
+            cols_desc = f" для столбцов {subset_cols}" if subset_cols else ""
+            self._log(f"Обработаны пропуски{cols_desc} стратегией: {strategy_desc}")
+            
+            if not self._verbose_stats:
+                return
+            
             # Подсчет пропущенных значений после обработки
             if strategy in ['dropna_rows', 'dropna_cols']:
-                # В случае удаления строк или столбцов temp_df уже не актуален
+                # В случае удаления строк или столбцов прежняя выборка колонок уже не актуальна
                 # поэтому просто подсчитаем пропуски в текущем DataFrame для тех же столбцов
                 cols_to_check = subset_cols if subset_cols and all(col in self.df.columns for col in subset_cols) else self.df.columns
-                missing_after = self.df[cols_to_check].isna().sum().sum()
+                missing_after = self._count_na(self.df[cols_to_check])
             else:
                 temp_after = self.df[subset_cols] if subset_cols else self.df
-                missing_after = temp_after.isna().sum().sum()
+                missing_after = self._count_na(temp_after)
             
-            # Логирование результатов
-            cols_desc = f" для столбцов {subset_cols}" if subset_cols else ""
-            self._log(f"Обработаны пропуски{cols_desc} стратегией: {strategy_desc}")
             self._log(f"Количество пропусков до: {missing_before}, после: {missing_after}")
             
         except Exception as e:
             self._log(f"Ошибка при обработке пропущенных значений: {str(e)}")
             raise
     
-    def convert_data_types(self, column_types: Dict[str, str], errors: str = 'raise') -> None:
+    @staticmethod
+    def _count_na(df: pd.DataFrame) -> int:
+        """
+        Подсчитывает количество пропусков в DataFrame.
+        
+        Для вещественных колонок NumPy пропуски считаются одним проходом np.isnan
+        по массиву колонки, без построения булева DataFrame и промежуточной Series,
+        как в df.isna().sum().sum(). Колонки остальных типов обрабатываются pandas.
+        
+        Args:
+            df (pd.DataFrame): DataFrame для подсчета.
+            
+        Returns:
+            int: Общее количество пропусков.
+        """
+        total = 0
+        for _, series in df.items():
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind == 'f':
+                total += int(np.count_nonzero(np.isnan(series.to_numpy())))
+            else:
+                total += int(series.isna().sum())
+        return total
+    
+    def _linear_interpolation_columns(
+            self, 
+            subset_cols: Optional[List[str]], 
+            method: str
+        ) -> Optional[List[str]]:
+        """
+        Определяет, применим ли быстрый путь линейной интерполяции, и возвращает колонки для него.
+        
+        Быстрый путь применим для метода 'linear', если все колонки (или колонки subset_cols)
+        имеют числовые типы NumPy, а имена колонок не повторяются. Пропуски возможны
+        только в вещественных колонках, поэтому интерполировать нужно только их:
+        целые и логические колонки DataFrame.interpolate не изменяет.
+        
+        Args:
+            subset_cols (List[str], optional): Колонки для интерполяции или None - все колонки.
+            method (str): Метод интерполяции.
+            
+        Returns:
+            Optional[List[str]]: Список вещественных колонок (возможно, пустой) или None,
+                если быстрый путь неприменим и нужно использовать pandas.
+        """
+        if method != 'linear' or not self.df.columns.is_unique:
+            return None
+        
+        dtypes = self.df[subset_cols].dtypes if subset_cols else self.df.dtypes
+        if not all(isinstance(dtype, np.dtype) and dtype.kind in 'fiub' for dtype in dtypes):
+            return None
+        return [col for col, dtype in dtypes.items() if dtype.kind == 'f']
+    
+    def _interpolate_with_polars(self, float_cols: List[str]) -> bool:
+        """
+        Выполняет линейную интерполяцию вещественных колонок в Polars.
+        
+        Polars обрабатывает все колонки одним запросом; на больших DataFrame это
+        в несколько раз быстрее DataFrame.interpolate даже с учетом преобразования
+        данных между pandas и Polars.
+        
+        Args:
+            float_cols (List[str]): Вещественные колонки для интерполяции.
+            
+        Returns:
+            bool: True, если интерполяция выполнена; False, если DataFrame меньше
+                _POLARS_MIN_ROWS строк или Polars не установлен.
+        """
+        if len(self.df) < _POLARS_MIN_ROWS:
+            return False
+        
+        try:
+            import polars as pl
+        except ImportError:
+            return False
+        
+        # Polars требует строковых имен колонок, поэтому колонки нумеруются
+        subset = self.df[float_cols]
+        subset.columns = [str(i) for i in range(len(float_cols))]
+        
+        # NaN преобразуются в null; forward_fill заполняет пропуски в конце колонки,
+        # как это делает pandas. Интерполяция выполняется в float64, как в pandas:
+        # в float32 промежуточные значения отличались бы в последних разрядах
+        result = (
+            pl.from_pandas(subset)
+            .lazy()
+            .with_columns(pl.all().cast(pl.Float64).interpolate().forward_fill())
+            .collect()
+            .to_pandas()
+        )
+        result.index = self.df.index
+        result.columns = float_cols
+        result = result.astype(dict(zip(float_cols, subset.dtypes)))
+        
+        self.df[float_cols] = result
+        return True
+    
+    def _interpolate_with_numpy(self, float_cols: List[str]) -> None:
+        """
+        Выполняет линейную интерполяцию вещественных колонок с помощью np.interp.
+        
+        Каждая колонка обрабатывается одним векторизованным вызовом np.interp
+        по позициям пропусков, без поблочной обработки DataFrame.interpolate.
+        
+        Args:
+            float_cols (List[str]): Вещественные колонки для интерполяции.
+        """
+        for col in float_cols:
+            values = self.df[col].to_numpy()
+            missing = np.isnan(values)
+            if missing.any():
+                self.df[col] = self._interpolate_linear_1d(values, missing)
+    
+    @staticmethod
+    def _interpolate_linear_1d(values: np.ndarray, missing: np.ndarray) -> np.ndarray:
+        """
+        Линейно интерполирует пропуски одномерного массива так же, как
+        DataFrame.interpolate(method='linear').
+        
+        Пропуски между известными значениями интерполируются по позициям элементов,
+        пропуски в конце заполняются последним известным значением, а пропуски
+        в начале массива остаются.
+        
+        Args:
+            values (np.ndarray): Вещественный массив с пропусками (NaN).
+            missing (np.ndarray): Булева маска пропусков в values.
+            
+        Returns:
+            np.ndarray: Новый массив того же типа с заполненными пропусками.
+        """
+        known = np.flatnonzero(~missing)
+        if not len(known):
+            return values
+        
+        gaps = np.flatnonzero(missing)
+        result = values.copy()
+        result[gaps] = np.interp(gaps, known, values[known])
+        result[:known[0]] = np.nan
+        return result
+    
+    def convert_data_types(
+            self, 
+            column_types: Dict[str, str], 
+            errors: str = 'raise',
+            compact: bool = False
+        ) -> None:
         """
         Преобразует типы данных указанных колонок.
         
+        Все преобразования, кроме 'datetime', выполняются одним вызовом
+        DataFrame.astype со словарем типов, без отдельного присваивания каждой колонки.
+        
         Args:
             column_types (Dict[str, str]): Словарь, где ключ - имя колонки, значение - целевой тип данных.
-                Поддерживаемые типы: 'float', 'int', 'str', 'category', 'bool', 'datetime'.
+                Поддерживаемые типы: 'float', 'int', 'str', 'category' (или 'cat'), 'bool', 'datetime'.
             errors (str, optional): Как обрабатывать ошибки при преобразовании.
                 'raise' - вызывать исключение, 'ignore' - пропускать ошибочные колонки.
                 По умолчанию 'raise'.
+            compact (bool, optional): Использовать компактные типы для экономии памяти:
+                'int' -> наименьший int8...int64 (Int8...Int64 при наличии пропусков),
+                в который помещаются значения колонки; 'float' -> float32, если все значения
+                представимы в нем точно (иначе float64); 'str' -> string[pyarrow] (если установлен
+                pyarrow). По умолчанию False.
                 
         Raises:
             KeyError: Если колонка не найдена в DataFrame и errors='raise'.
@@ -245,55 +822,109 @@ class DataFrameProcessor:
         """
         try:
             # Проверим, что все запрашиваемые колонки существуют
-            missing_columns = [col for col in column_types.keys() if col not in self.df.columns]
+            available = set(self.df.columns)
+            missing_columns = [col for col in column_types.keys() if col not in available]
             if missing_columns and errors == 'raise':
                 raise KeyError(f"Следующие колонки не найдены в DataFrame: {missing_columns}")
             
-            # Для каждой колонки применяем указанное преобразование типа
+            dtype_aliases = _COMPACT_DTYPE_ALIASES if compact else _DTYPE_ALIASES
+            
+            # Наличие пропусков во всех колонках, приводимых к int, проверяется одной редукцией
+            int_cols = [col for col, target_type in column_types.items() if target_type == 'int' and col in available]
+            int_cols_with_na = self.df[int_cols].isna().any() if int_cols else pd.Series(dtype=bool)
+            
+            # Собираем словарь целевых типов для единого вызова astype.
+            # Колонки datetime обрабатываются отдельно через pd.to_datetime
+            type_map = {}
+            datetime_cols = []
             for col, target_type in column_types.items():
-                if col not in self.df.columns:
-                    if errors == 'ignore':
-                        self._log(f"Колонка '{col}' не найдена, пропускаю (errors=ignore)")
-                        continue
-                
-                # Запоминаем исходный тип
-                original_dtype = str(self.df[col].dtype)
+                if col not in available:
+                    self._log(f"Колонка '{col}' не найдена, пропускаю (errors=ignore)")
+                    continue
                 
-                try:
-                    # Обрабатываем по типам
-                    if target_type == 'float':
-                        self.df[col] = self.df[col].astype(float, errors=errors)
-                    elif target_type == 'int':
-                        # Для int подход немного сложнее из-за NaN
-                        if self.df[col].isna().any():
-                            # Int64 может содержать NaN
-                            self.df[col] = self.df[col].astype('Int64', errors=errors)
-                        else:
-                            self.df[col] = self.df[col].astype(int, errors=errors)
-                    elif target_type == 'str':
-                        self.df[col] = self.df[col].astype(str, errors=errors)
-                    elif target_type == 'category':
-                        self.df[col] = self.df[col].astype('category', errors=errors)
-                    elif target_type == 'bool':
-                        self.df[col] = self.df[col].astype(bool, errors=errors)
-                    elif target_type == 'datetime':
-                        self.df[col] = pd.to_datetime(self.df[col], errors=errors)
-                    else:
+                if target_type == 'datetime':
+                    datetime_cols.append(col)
+                elif target_type not in dtype_aliases:
+                    if errors == 'raise':
                         raise ValueError(f"Неподдерживаемый тип данных: '{target_type}'")
-                    
-                    new_dtype = str(self.df[col].dtype)
-                    self._log(f"Преобразован тип колонки '{col}': {original_dtype} -> {new_dtype}")
-                    
+                    self._log(f"Неподдерживаемый тип данных '{target_type}' для колонки '{col}'. "
+                              f"Пропускаю (errors=ignore)")
+                elif target_type == 'int' and int_cols_with_na[col]:
+                    # Для int подход немного сложнее из-за NaN: nullable-тип может содержать пропуски
+                    type_map[col] = 'Int64'
+                else:
+                    type_map[col] = dtype_aliases[target_type]
+            
+            # Запоминаем исходные типы
+            original_dtypes = {col: str(self.df[col].dtype) for col in [*type_map, *datetime_cols]}
+            converted_cols = []
+            
+            if type_map:
+                try:
+                    self.df = self.df.astype(type_map)
+                    converted_cols.extend(type_map)
+                except Exception:
+                    # Повторяем преобразование по колонкам, чтобы определить ошибочную колонку
+                    # и, при errors='ignore', пропустить только ее
+                    self._ensure_owned()
+                    for col, dtype in type_map.items():
+                        try:
+                            self.df[col] = self.df[col].astype(dtype)
+                            converted_cols.append(col)
+                        except Exception as e:
+                            if errors == 'raise':
+                                raise ValueError(f"Ошибка при преобразовании колонки '{col}' "
+                                                 f"в {column_types[col]}: {str(e)}")
+                            self._log(f"Не удалось преобразовать '{col}' в {column_types[col]}: {str(e)}. "
+                                      f"Пропускаю (errors=ignore)")
+            
+            # Компактные числовые типы: ширина выбирается по значениям каждой колонки,
+            # поэтому значения, не помещающиеся в меньший тип, не искажаются
+            compact_cols = [col for col in converted_cols if compact and column_types[col] in _COMPACT_DOWNCAST]
+            if compact_cols or datetime_cols:
+                self._ensure_owned()
+            for col in compact_cols:
+                self.df[col] = self._downcast_compact(self.df[col], column_types[col])
+            
+            for col in datetime_cols:
+                try:
+                    self.df[col] = pd.to_datetime(self.df[col], errors=errors)
+                    converted_cols.append(col)
                 except Exception as e:
                     if errors == 'raise':
-                        raise ValueError(f"Ошибка при преобразовании колонки '{col}' в {target_type}: {str(e)}")
-                    else:
-                        self._log(f"Не удалось преобразовать '{col}' в {target_type}: {str(e)}. Пропускаю (errors=ignore)")
+                        raise ValueError(f"Ошибка при преобразовании колонки '{col}' в datetime: {str(e)}")
+                    self._log(f"Не удалось преобразовать '{col}' в datetime: {str(e)}. Пропускаю (errors=ignore)")
+            
+            for col in converted_cols:
+                self._log(f"Преобразован тип колонки '{col}': {original_dtypes[col]} -> {self.df[col].dtype}")
                 
         except Exception as e:
             self._log(f"Ошибка при преобразовании типов данных: {str(e)}")
             raise
     
+    @staticmethod
+    def _downcast_compact(series: pd.Series, target_type: str) -> pd.Series:
+        """
+        Уменьшает числовую колонку до наименьшего типа, в который помещаются ее значения.
+        
+        Args:
+            series (pd.Series): Колонка, уже приведенная к int64/Int64 или float64.
+            target_type (str): 'int' или 'float'.
+            
+        Returns:
+            pd.Series: Колонка наименьшего подходящего типа.
+        """
+        if target_type == 'float':
+            # pd.to_numeric(downcast='float') допускает расхождение в пределах допуска
+            # np.allclose (например, 1e-50 стал бы 0.0), поэтому float32 используется,
+            # только если значения восстанавливаются из него без изменений
+            values = series.to_numpy(dtype='float64')
+            downcasted = values.astype('float32')
+            if np.array_equal(downcasted.astype('float64'), values, equal_nan=True):
+                return series.astype('float32')
+            return series
+        return pd.to_numeric(series, downcast=_COMPACT_DOWNCAST[target_type])
+    
     def remove_duplicate_rows(self, subset: Optional[List[str]] = None, keep: str = 'first') -> None:
         """
         Удаляет дублирующиеся строки в DataFrame.
@@ -319,7 +950,7 @@ class DataFrameProcessor:
             orig_count = len(self.df)
             
             # Удаляем дубликаты
-            self.df = self.df.drop_duplicates(subset=subset, keep=keep)
+            self.df = self.df[~self._find_duplicated_rows(subset, keep)]
             
             # Подсчитываем удаленные строки
             removed_count = orig_count - len(self.df)
@@ -338,6 +969,58 @@ class DataFrameProcessor:
             self._log(f"Ошибка при удалении дублирующихся строк: {str(e)}")
             raise
     
+    def _find_duplicated_rows(self, subset: Optional[List[str]], keep: Any) -> np.ndarray:
+        """
+        Находит дублирующиеся строки с предварительной фильтрацией по хэшу строк.
+        
+        Для числовых, логических, временных и категориальных колонок сначала вычисляется
+        один 64-битный хэш на строку (pd.util.hash_pandas_object): это быстрее, чем
+        факторизация каждой колонки в DataFrame.duplicated, особенно для широких
+        DataFrame. Дубликатами могут быть только строки с повторяющимся хэшем; если
+        таких нет, сравнение значений не выполняется. Иначе строки-кандидаты проверяются
+        точным DataFrame.duplicated, поэтому совпадения хэшей не влияют на результат.
+        Хэширование строковых (object) колонок медленнее факторизации, поэтому для них
+        сразу используется DataFrame.duplicated. Для одной колонки хэш строки не нужен:
+        Series.duplicated строит хэш-таблицу по ее значениям за один проход.
+        
+        Args:
+            subset (List[str], optional): Колонки, по которым определяются дубликаты.
+            keep (str): 'first', 'last' или False - как в DataFrame.duplicated.
+            
+        Returns:
+            np.ndarray: Булев массив, True для строк, которые нужно удалить.
+        """
+        keys = self.df[subset] if subset else self.df
+        
+        if keys.shape[1] == 1:
+            return keys.iloc[:, 0].duplicated(keep=keep).to_numpy()
+        
+        if not all(
+            pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype)
+            or isinstance(dtype, pd.CategoricalDtype)
+            for dtype in keys.dtypes
+        ):
+            return self.df.duplicated(subset=subset, keep=keep).to_numpy()
+        
+        try:
+            # Для хэша -0.0 и 0.0 различаются, а для duplicated равны, поэтому
+            # знак нуля в вещественных колонках предварительно нормализуется
+            if any(pd.api.types.is_float_dtype(dtype) for dtype in keys.dtypes):
+                keys = pd.DataFrame({
+                    i: series + 0.0 if pd.api.types.is_float_dtype(series) else series
+                    for i, (_, series) in enumerate(keys.items())
+                }, copy=False)
+            row_hashes = pd.util.hash_pandas_object(keys, index=False)
+        except TypeError:
+            # Значения, которые не удалось хэшировать, - используем обычную проверку
+            return self.df.duplicated(subset=subset, keep=keep).to_numpy()
+        
+        candidates = np.flatnonzero(row_hashes.duplicated(keep=False).to_numpy())
+        duplicated = np.zeros(len(self.df), dtype=bool)
+        if len(candidates):
+            duplicated[candidates] = self.df.iloc[candidates].duplicated(subset=subset, keep=keep).to_numpy()
+        return duplicated
+    
     def rename_columns(self, rename_map: Dict[str, str]) -> None:
         """
         Переименовывает колонки DataFrame согласно указанному словарю.
@@ -355,8 +1038,12 @@ class DataFrameProcessor:
             if missing_columns:
                 raise KeyError(f"Следующие колонки для переименования не найдены: {missing_columns}")
             
-            # Переименовываем колонки
-            self.df = self.df.rename(columns=rename_map)
+            # Переименовываем колонки. При CoW rename не копирует данные; без CoW
+            # копирование по умолчанию выполняется, поэтому отключаем его явно
+            if _copy_on_write_active():
+                self.df = self.df.rename(columns=rename_map)
+            else:
+                self.df = self.df.rename(columns=rename_map, copy=False)
             
             # Логируем результат
             renamed_pairs = [f"'{old}' -> '{new}'" for old, new in rename_map.items()]
@@ -385,8 +1072,12 @@ class DataFrameProcessor:
             # Запоминаем исходные колонки
             original_columns = set(self.df.columns)
             
-            # Выбираем только нужные колонки
+            # Выбираем только нужные колонки. При CoW выборка не копирует данные.
+            # Без CoW pandas копирует выбранные колонки, поэтому результат уже
+            # не разделяет данные с исходным DataFrame и повторная копия не нужна
             self.df = self.df[columns_to_keep]
+            if not _copy_on_write_active():
+                self._owns_data = True
             
             # Логируем результат
             removed_columns = original_columns - set(columns_to_keep)
@@ -414,9 +1105,10 @@ class DataFrameProcessor:
         try:
             # Запоминаем исходное состояние DataFrame
             orig_shape = self.df.shape
-            orig_dtypes = self.df.dtypes.to_dict()
+            orig_dtypes = self.df.dtypes.to_dict() if self._verbose_stats else None
             
-            # Применяем пользовательскую функцию
+            # Применяем пользовательскую функцию (она может изменить DataFrame на месте)
+            self._ensure_owned()
             result = func(self.df, *args, **kwargs)
             
             # Проверяем, что результат - DataFrame
@@ -432,25 +1124,9 @@ class DataFrameProcessor:
                 self._log(f"Размер DataFrame изменился после пользовательской функции: "
                        f"{orig_shape} -> {self.df.shape}")
             
-            # Проверяем изменение типов колонок
-            new_dtypes = self.df.dtypes.to_dict()
-            changed_dtypes = {col: (orig_dtypes[col], new_dtypes[col]) 
-                             for col in set(orig_dtypes).intersection(new_dtypes)
-                             if orig_dtypes[col] != new_dtypes[col]}
-            
-            if changed_dtypes:
-                changes = [f"'{col}': {old} -> {new}" 
-                          for col, (old, new) in changed_dtypes.items()]
-                self._log(f"Изменились типы следующих колонок: {', '.join(changes)}")
-            
-            # Проверяем новые и удаленные колонки
-            new_columns = set(new_dtypes) - set(orig_dtypes)
-            if new_columns:
-                self._log(f"Добавлены колонки: {list(new_columns)}")
-                
-            removed_columns = set(orig_dtypes) - set(new_dtypes)
-            if removed_columns:
-                self._log(f"Удалены колонки: {list(removed_columns)}")
+            # Сравнение типов и состава колонок выполняется только при verbose_stats
+            if orig_dtypes is not None:
+                self._log_dtype_changes(orig_dtypes, self.df.dtypes.to_dict())
             
             self._log("Пользовательская функция успешно применена")
             
@@ -458,15 +1134,449 @@ class DataFrameProcessor:
             self._log(f"Ошибка при применении пользовательской функции: {str(e)}")
             raise
     
-    def get_processed_df(self) -> pd.DataFrame:
+    def _log_dtype_changes(self, orig_dtypes: Dict[Any, Any], new_dtypes: Dict[Any, Any]) -> None:
+        """
+        Логирует изменение типов, добавленные и удаленные колонки.
+        
+        Args:
+            orig_dtypes (Dict[Any, Any]): Типы колонок до изменения.
+            new_dtypes (Dict[Any, Any]): Типы колонок после изменения.
+        """
+        # Проверяем изменение типов колонок
+        changed_dtypes = {col: (orig_dtypes[col], new_dtypes[col]) 
+                         for col in set(orig_dtypes).intersection(new_dtypes)
+                         if orig_dtypes[col] != new_dtypes[col]}
+        
+        if changed_dtypes:
+            changes = [f"'{col}': {old} -> {new}" 
+                      for col, (old, new) in changed_dtypes.items()]
+            self._log(f"Изменились типы следующих колонок: {', '.join(changes)}")
+        
+        # Проверяем новые и удаленные колонки
+        new_columns = set(new_dtypes) - set(orig_dtypes)
+        if new_columns:
+            self._log(f"Добавлены колонки: {list(new_columns)}")
+            
+        removed_columns = set(orig_dtypes) - set(new_dtypes)
+        if removed_columns:
+            self._log(f"Удалены колонки: {list(removed_columns)}")
+    
+    def apply_pipeline(
+            self, 
+            steps: List[Dict[str, Any]], 
+            stop_on_error: bool = True,
+            ignore_missing_columns: bool = False
+        ) -> None:
+        """
+        Выполняет последовательность шагов обработки, объединяя поколоночные шаги в один проход.
+        
+        Идущие подряд поколоночные шаги (заполнение пропусков стратегиями ffill, bfill,
+        fill_constant, fill_mean, fill_median, fill_zero, преобразование типов,
+        переименование и выбор колонок) не выполняются по отдельности: для каждой колонки
+        строится цепочка преобразований, и итоговый DataFrame собирается за один проход
+        по колонкам. Остальные шаги выполняются соответствующими методами класса.
+        Для объединенных шагов количество пропусков до/после не подсчитывается.
+        
+        Args:
+            steps (List[Dict[str, Any]]): Список шагов вида
+                {'op': 'handle_missing_values', 'params': {'strategy': 'ffill'}, 'title': '...'}.
+                'op' - имя метода класса (set_datetime_index, handle_missing_values,
+                convert_data_types, remove_duplicate_rows, rename_columns, select_columns),
+                'params' - аргументы метода, 'title' - необязательный заголовок шага для лога.
+            stop_on_error (bool, optional): Прерывать ли выполнение при ошибке шага.
+                Если False, ошибка логируется, а шаг пропускается. По умолчанию True.
+            ignore_missing_columns (bool, optional): Исключать ли из списков колонок
+                (subset_cols, subset, columns_to_keep) и из ключей словарей (column_types,
+                rename_map) колонки, отсутствующие на момент выполнения шага. Шаг,
+                в котором не осталось колонок, пропускается.
+                По умолчанию False.
+                
+        Raises:
+            ValueError: Если указана неподдерживаемая операция или шаг завершился ошибкой
+                при stop_on_error=True.
+        """
+        try:
+            group = []
+            for step in steps:
+                if step.get('op') not in _PIPELINE_OPS:
+                    raise ValueError(f"Операция '{step.get('op')}' не поддерживается. "
+                                     f"Допустимые операции: {', '.join(_PIPELINE_OPS)}")
+                
+                if self._is_fusable_step(step):
+                    group.append(step)
+                    continue
+                
+                self._run_fused_steps(group, stop_on_error, ignore_missing_columns)
+                group = []
+                self._run_step(step, stop_on_error, ignore_missing_columns)
+            
+            self._run_fused_steps(group, stop_on_error, ignore_missing_columns)
+            
+        except Exception as e:
+            self._log(f"Ошибка при выполнении конвейера обработки: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _is_fusable_step(step: Dict[str, Any]) -> bool:
+        """
+        Проверяет, может ли шаг конвейера быть объединен с соседними поколоночными шагами.
+        
+        Args:
+            step (Dict[str, Any]): Шаг конвейера.
+            
+        Returns:
+            bool: True, если шаг применяется к каждой колонке независимо.
+        """
+        op = step['op']
+        if op == 'handle_missing_values':
+            return step.get('params', {}).get('strategy', 'ffill') in _FUSABLE_MISSING_STRATEGIES
+        return op in ('convert_data_types', 'rename_columns', 'select_columns')
+    
+    def _filter_step_columns(
+            self, 
+            step: Dict[str, Any], 
+            available: List[str], 
+            log_func: Callable[[str], None]
+        ) -> Optional[Dict[str, Any]]:
+        """
+        Исключает из списка колонок шага (или из ключей словаря, например rename_map
+        и column_types) колонки, отсутствующие среди available.
+        
+        Проверка выполняется по множеству имен до вызова pandas, поэтому опечатка
+        в имени колонки не прерывает шаг на середине.
+        
+        Args:
+            step (Dict[str, Any]): Шаг конвейера.
+            available (List[str]): Имена колонок, доступных на момент выполнения шага.
+            log_func (Callable[[str], None]): Функция записи сообщений шага.
+            
+        Returns:
+            Optional[Dict[str, Any]]: Параметры шага с отфильтрованным списком колонок или None,
+                если ни одна из указанных колонок не найдена и шаг нужно пропустить.
+        """
+        params = dict(step.get('params', {}))
+        param_name = _COLUMN_LIST_PARAMS.get(step['op'])
+        columns = params.get(param_name) if param_name else None
+        if not columns:
+            return params
+        
+        available_set = set(available)
+        # Отбрасываем только пустые строки: метка 0 - допустимое имя колонки
+        names = [col for col in columns if col != '']
+        missing = [col for col in names if col not in available_set]
+        if missing:
+            log_func(f"Колонки не найдены и будут пропущены: {missing}")
+        
+        if isinstance(columns, dict):
+            params[param_name] = {col: columns[col] for col in names if col in available_set}
+        else:
+            params[param_name] = [col for col in names if col in available_set]
+        if not params[param_name]:
+            log_func("Ни одна из указанных колонок не найдена. Пропускаю этот шаг.")
+            return None
+        return params
+    
+    def _run_step(self, step: Dict[str, Any], stop_on_error: bool, ignore_missing_columns: bool) -> None:
+        """
+        Выполняет один шаг конвейера соответствующим методом класса.
+        
+        Args:
+            step (Dict[str, Any]): Шаг конвейера.
+            stop_on_error (bool): Пробрасывать ли исключение шага.
+            ignore_missing_columns (bool): Исключать ли отсутствующие колонки из списков колонок.
+        """
+        if step.get('title'):
+            self._log(f"\n--- {step['title']} ---")
+        
+        try:
+            if ignore_missing_columns:
+                params = self._filter_step_columns(step, list(self.df.columns), self._log)
+                if params is None:
+                    return
+            else:
+                params = step.get('params', {})
+            
+            getattr(self, step['op'])(**params)
+        except Exception:
+            # Метод уже залогировал ошибку
+            if stop_on_error:
+                raise
+    
+    def _run_fused_steps(
+            self, 
+            steps: List[Dict[str, Any]], 
+            stop_on_error: bool, 
+            ignore_missing_columns: bool
+        ) -> None:
+        """
+        Выполняет группу поколоночных шагов за один проход по колонкам.
+        
+        Сначала для каждой колонки строится цепочка преобразований (план), затем
+        итоговый DataFrame собирается из преобразованных колонок одним вызовом.
+        
+        Args:
+            steps (List[Dict[str, Any]]): Поколоночные шаги конвейера.
+            stop_on_error (bool): Пробрасывать ли исключения шагов.
+            ignore_missing_columns (bool): Исключать ли отсутствующие колонки из списков колонок.
+        """
+        if not steps:
+            return
+        
+        # Одиночный шаг или колонки с повторяющимися именами - выполняем шаги по отдельности
+        if len(steps) == 1 or not self.df.columns.is_unique:
+            for step in steps:
+                self._run_step(step, stop_on_error, ignore_missing_columns)
+            return
+        
+        # План: список [исходная колонка, текущее имя, список (номер шага, преобразование)]
+        plan = [[col, col, []] for col in self.df.columns]
+        # Сообщения копятся по шагам и выводятся после выполнения плана в порядке шагов:
+        # иначе результаты преобразований оказались бы в логе после сообщений последующих шагов
+        step_logs = [[] for _ in steps]
+        
+        for step_index, step in enumerate(steps):
+            log = step_logs[step_index].append
+            if step.get('title'):
+                log(f"\n--- {step['title']} ---")
+            
+            try:
+                if ignore_missing_columns:
+                    params = self._filter_step_columns(step, [entry[1] for entry in plan], log)
+                    if params is None:
+                        continue
+                else:
+                    params = step.get('params', {})
+                
+                plan = self._plan_step(plan, step['op'], params, step_index, log)
+            except Exception as e:
+                log(f"Ошибка на шаге '{step['op']}': {str(e)}")
+                if stop_on_error:
+                    self._emit_step_logs(step_logs[:step_index + 1])
+                    raise
+        
+        # Выполняем план: каждая колонка проходит всю цепочку преобразований один раз
+        columns = {}
+        for position, (source_col, name, transforms) in enumerate(plan):
+            series = self.df[source_col]
+            for step_index, transform in transforms:
+                try:
+                    series = transform(series)
+                except Exception as e:
+                    step_logs[step_index].append(f"Ошибка при обработке колонки '{name}': {str(e)}")
+                    if stop_on_error:
+                        # Результат группы не применяется - сообщения последующих шагов не выводим
+                        self._emit_step_logs(step_logs[:step_index + 1])
+                        self._log("Изменения объединенных шагов не применены")
+                        raise
+            columns[position] = series
+        
+        self._emit_step_logs(step_logs)
+        result = pd.DataFrame(columns, index=self.df.index, copy=False)
+        result.columns = pd.Index([entry[1] for entry in plan], name=self.df.columns.name)
+        self.df = result
+    
+    def _emit_step_logs(self, step_logs: List[List[str]]) -> None:
+        """
+        Выводит накопленные сообщения шагов в порядке шагов.
+        
+        Args:
+            step_logs (List[List[str]]): Сообщения каждого шага.
+        """
+        for messages in step_logs:
+            for message in messages:
+                self._log(message)
+    
+    def _plan_step(
+            self, 
+            plan: List[list], 
+            op: str, 
+            params: Dict[str, Any], 
+            step_index: int, 
+            log_func: Callable[[str], None]
+        ) -> List[list]:
+        """
+        Добавляет поколоночный шаг в план конвейера.
+        
+        Args:
+            plan (List[list]): Текущий план - список [исходная колонка, текущее имя, преобразования].
+            op (str): Имя операции.
+            params (Dict[str, Any]): Аргументы операции.
+            step_index (int): Номер шага в группе, которым помечаются его преобразования.
+            log_func (Callable[[str], None]): Функция записи сообщений шага.
+            
+        Returns:
+            List[list]: Новый план. Исходный план не изменяется, поэтому при ошибке
+                проверки шаг не применяется частично.
+                
+        Raises:
+            KeyError, ValueError: При тех же ошибках проверки, что и соответствующий метод класса.
+        """
+        names = [entry[1] for entry in plan]
+        
+        if op == 'handle_missing_values':
+            strategy = params.get('strategy', 'ffill')
+            subset_cols = params.get('subset_cols')
+            fill_value = params.get('fill_value')
+            
+            if subset_cols:
+                for col in subset_cols:
+                    if col not in names:
+                        raise ValueError(f"Столбец '{col}' не найден в DataFrame")
+            
+            if strategy == 'ffill':
+                transform, strategy_desc = (lambda s: s.ffill()), "заполнение вперед (ffill)"
+            elif strategy == 'bfill':
+                transform, strategy_desc = (lambda s: s.bfill()), "заполнение назад (bfill)"
+            elif strategy == 'fill_constant':
+                if fill_value is None:
+                    raise ValueError("При использовании стратегии 'fill_constant' необходимо указать значение fill_value")
+                transform, strategy_desc = (lambda s: s.fillna(fill_value)), f"заполнение константой {fill_value}"
+            elif strategy == 'fill_mean':
+                transform = lambda s: s.fillna(s.mean()) if pd.api.types.is_numeric_dtype(s) else s
+                strategy_desc = "заполнение средним"
+            elif strategy == 'fill_median':
+                transform = lambda s: s.fillna(s.median()) if pd.api.types.is_numeric_dtype(s) else s
+                strategy_desc = "заполнение медианой"
+            else:
+                transform, strategy_desc = (lambda s: s.fillna(0)), "заполнение нулями"
+            
+            targets = set(subset_cols) if subset_cols else set(names)
+            new_plan = [
+                [source, name, transforms + [(step_index, transform)]] if name in targets else [source, name, transforms]
+                for source, name, transforms in plan
+            ]
+            
+            cols_desc = f" для столбцов {subset_cols}" if subset_cols else ""
+            log_func(f"Обработаны пропуски{cols_desc} стратегией: {strategy_desc}")
+            return new_plan
+        
+        if op == 'convert_data_types':
+            column_types = params['column_types']
+            errors = params.get('errors', 'raise')
+            compact = params.get('compact', False)
+            
+            missing_columns = [col for col in column_types if col not in names]
+            if missing_columns and errors == 'raise':
+                raise KeyError(f"Следующие колонки не найдены в DataFrame: {missing_columns}")
+            for col in missing_columns:
+                log_func(f"Колонка '{col}' не найдена, пропускаю (errors=ignore)")
+            
+            dtype_aliases = _COMPACT_DTYPE_ALIASES if compact else _DTYPE_ALIASES
+            transforms_by_name = {}
+            for col, target_type in column_types.items():
+                if col in missing_columns:
+                    continue
+                if target_type != 'datetime' and target_type not in dtype_aliases:
+                    if errors == 'raise':
+                        raise ValueError(f"Неподдерживаемый тип данных: '{target_type}'")
+                    log_func(f"Неподдерживаемый тип данных '{target_type}' для колонки '{col}'. "
+                             f"Пропускаю (errors=ignore)")
+                    continue
+                transforms_by_name[col] = self._make_type_transform(
+                    col, target_type, errors, dtype_aliases, compact, log_func
+                )
+            
+            return [
+                [source, name, transforms + [(step_index, transforms_by_name[name])]] if name in transforms_by_name
+                else [source, name, transforms]
+                for source, name, transforms in plan
+            ]
+        
+        if op == 'rename_columns':
+            rename_map = params['rename_map']
+            missing_columns = [col for col in rename_map if col not in names]
+            if missing_columns:
+                raise KeyError(f"Следующие колонки для переименования не найдены: {missing_columns}")
+            
+            renamed_pairs = [f"'{old}' -> '{new}'" for old, new in rename_map.items()]
+            log_func(f"Переименованы колонки: {', '.join(renamed_pairs)}")
+            return [[source, rename_map.get(name, name), transforms] for source, name, transforms in plan]
+        
+        if op == 'select_columns':
+            columns_to_keep = params['columns_to_keep']
+            missing_columns = [col for col in columns_to_keep if col not in names]
+            if missing_columns:
+                raise ValueError(f"Следующие колонки не найдены: {missing_columns}")
+            
+            entries_by_name = {}
+            for entry in plan:
+                entries_by_name.setdefault(entry[1], []).append(entry)
+            
+            log_func(f"Оставлены колонки: {columns_to_keep}")
+            removed_columns = set(names) - set(columns_to_keep)
+            if removed_columns:
+                log_func(f"Удалены колонки: {list(removed_columns)}")
+            return [entry for col in columns_to_keep for entry in entries_by_name[col]]
+        
+        raise ValueError(f"Операция '{op}' не может быть объединена с другими шагами")
+    
+    def _make_type_transform(
+            self, 
+            col: str, 
+            target_type: str, 
+            errors: str, 
+            dtype_aliases: Dict[str, Any],
+            compact: bool,
+            log_func: Callable[[str], None]
+        ) -> Callable[[pd.Series], pd.Series]:
+        """
+        Создает функцию преобразования типа одной колонки для плана конвейера.
+        
+        Args:
+            col (str): Имя колонки (для лога).
+            target_type (str): Целевой тип в терминах convert_data_types.
+            errors (str): 'raise' или 'ignore'.
+            dtype_aliases (Dict[str, Any]): Соответствие имен типов типам pandas.
+            compact (bool): Использовать ли компактные типы.
+            log_func (Callable[[str], None]): Функция записи сообщений шага.
+            
+        Returns:
+            Callable[[pd.Series], pd.Series]: Функция преобразования колонки.
+        """
+        def transform(series: pd.Series) -> pd.Series:
+            try:
+                if target_type == 'datetime':
+                    result = pd.to_datetime(series, errors=errors)
+                elif target_type == 'int' and series.isna().any():
+                    # Nullable-тип может содержать пропуски
+                    result = series.astype('Int64')
+                else:
+                    result = series.astype(dtype_aliases[target_type])
+                if compact and target_type in _COMPACT_DOWNCAST:
+                    result = self._downcast_compact(result, target_type)
+            except Exception as e:
+                if errors == 'raise':
+                    raise ValueError(f"Ошибка при преобразовании колонки '{col}' в {target_type}: {str(e)}")
+                log_func(f"Не удалось преобразовать '{col}' в {target_type}: {str(e)}. Пропускаю (errors=ignore)")
+                return series
+            
+            log_func(f"Преобразован тип колонки '{col}': {series.dtype} -> {result.dtype}")
+            return result
+        
+        return transform
+    
+    def get_processed_df(self, copy: bool = True) -> pd.DataFrame:
         """
         Возвращает обработанный DataFrame.
         
+        При Copy-on-Write копия поверхностная: она независима от self.df,
+        но данные копируются только при изменении. Без CoW создается полная копия.
+        
+        Args:
+            copy (bool, optional): Возвращать ли копию. При copy=False возвращается
+                сам рабочий DataFrame без копирования данных; вызывающий код не должен
+                изменять его на месте, если обработчик будет использоваться дальше.
+                Без CoW данные, еще общие с исходным DataFrame, при этом копируются
+                (см. _ensure_owned). По умолчанию True.
+        
         Returns:
             pd.DataFrame: Обработанный DataFrame.
         """
         self._log(f"Получен обработанный DataFrame размером {self.df.shape}")
-        return self.df.copy()
+        if not copy:
+            self._ensure_owned()
+            return self.df
+        return self.df.copy(deep=not _copy_on_write_active())
     
     def get_log_messages(self) -> List[str]:
         """
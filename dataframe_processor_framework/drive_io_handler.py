@@ -6,10 +6,52 @@
 """
 
 import os
-import pandas as pd
 import json
 from datetime import datetime
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Callable, TYPE_CHECKING
+
+# pandas нужен только для аннотаций: методы DataFrame вызываются у переданного объекта,
+# поэтому импорт модуля не требует загрузки pandas
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# orjson (если установлен) быстрее записывает метаданные и поддерживает типы NumPy
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Количество строк в группе строк parquet-файла: достаточно крупные группы
+# сжимаются эффективно и при этом позволяют читать файл по частям
+_PARQUET_ROW_GROUP_SIZE = 256 * 1024
+
+# Размер страницы данных parquet (1 МБ)
+_PARQUET_DATA_PAGE_SIZE = 1 << 20
+
+# Уровень сжатия zstd: минимальный уровень дает наибольшую скорость записи
+# при степени сжатия, сравнимой со snappy
+_ZSTD_COMPRESSION_LEVEL = 1
+
+# Пакеты, в которых определены классы Dask DataFrame
+_DASK_MODULES = ('dask', 'dask_expr')
+
+
+def _is_dask_dataframe(df: Any) -> bool:
+    """
+    Проверяет, является ли объект Dask DataFrame, не импортируя dask.
+    
+    Версии dask, использующие отдельный пакет dask-expr, возвращают объекты
+    класса dask_expr._collection.DataFrame, поэтому учитываются оба пакета.
+    
+    Args:
+        df (Any): Проверяемый объект.
+        
+    Returns:
+        bool: True, если df - dask.dataframe.DataFrame.
+    """
+    return type(df).__module__.split('.')[0] in _DASK_MODULES and type(df).__name__ == 'DataFrame'
 
 
 class DriveIOHandler:
@@ -26,18 +68,44 @@ class DriveIOHandler:
                 По умолчанию '/content/drive/MyDrive/processed_data/'.
         """
         self.base_save_path = base_save_path
-        # Проверяем и создаем директорию, если она не существует
+        # Результат последней успешной проверки диска. Пока он действителен, перед
+        # сохранением не выполняются обращения к файловой системе (на Google Drive
+        # каждое из них - сетевой запрос); повторная проверка - только после ошибки записи
+        self._mounted = False
+        # Создаем директорию, если она не существует
         try:
-            if not os.path.exists(self.base_save_path):
-                os.makedirs(self.base_save_path, exist_ok=True)
-                print(f"Создана директория для сохранения: {self.base_save_path}")
+            self._create_save_dir()
         except Exception as e:
             print(f"Предупреждение: не удалось создать директорию {self.base_save_path}: {str(e)}")
+    
+    def _create_save_dir(self, log_func: Callable[[str], None] = print) -> None:
+        """
+        Создает директорию base_save_path, если она не существует.
+        
+        Вместо предварительной проверки os.path.exists директория создается сразу:
+        одно обращение к файловой системе вместо двух.
+        
+        Args:
+            log_func (Callable[[str], None], optional): Функция вывода сообщений.
+                По умолчанию print.
+        
+        Raises:
+            OSError: Если директорию не удалось создать.
+        """
+        try:
+            os.makedirs(self.base_save_path)
+        except FileExistsError:
+            return
+        log_func(f"Создана директория для сохранения: {self.base_save_path}")
 
-    def _ensure_drive_mounted(self) -> bool:
+    def _ensure_drive_mounted(self, log_func: Callable[[str], None] = print) -> bool:
         """
         Проверяет, смонтирован ли Google Drive и пытается смонтировать его при необходимости.
         
+        Args:
+            log_func (Callable[[str], None], optional): Функция вывода сообщений.
+                По умолчанию print.
+        
         Returns:
             bool: True, если диск успешно смонтирован или уже был смонтирован, False в случае ошибки.
             
@@ -50,52 +118,212 @@ class DriveIOHandler:
                 try:
                     # Импортируем библиотеку google.colab.drive только в среде Colab
                     from google.colab import drive
-                    print("Монтирую Google Drive...")
+                    log_func("Монтирую Google Drive...")
                     drive.mount('/content/drive', force_remount=True)
-                    print("Google Drive успешно смонтирован")
+                    log_func("Google Drive успешно смонтирован")
                 except ImportError:
-                    print("Предупреждение: google.colab.drive не найден. "
+                    log_func("Предупреждение: google.colab.drive не найден. "
                          "Убедитесь, что вы работаете в Google Colab и диск смонтирован вручную.")
                     return False
                 except Exception as e:
-                    print(f"Ошибка при монтировании Google Drive: {str(e)}")
+                    log_func(f"Ошибка при монтировании Google Drive: {str(e)}")
                     return False
                 
             # Проверяем наличие директории для сохранения
-            if not os.path.exists(self.base_save_path):
-                try:
-                    os.makedirs(self.base_save_path, exist_ok=True)
-                    print(f"Создана директория для сохранения: {self.base_save_path}")
-                except Exception as e:
-                    print(f"Не удалось создать директорию {self.base_save_path}: {str(e)}")
-                    return False
+            try:
+                self._create_save_dir(log_func)
+            except Exception as e:
+                log_func(f"Не удалось создать директорию {self.base_save_path}: {str(e)}")
+                return False
             
+            self._mounted = True
             return True
         
         except Exception as e:
-            print(f"Ошибка при проверке/монтировании Google Drive: {str(e)}")
+            log_func(f"Ошибка при проверке/монтировании Google Drive: {str(e)}")
             return False
 
+    @staticmethod
+    def _write_csv(df: 'pd.DataFrame', path: str, engine: str = 'pandas') -> None:
+        """
+        Записывает DataFrame в CSV с индексом в первых колонках.
+        
+        При engine='pyarrow' запись выполняется многопоточным модулем pyarrow.csv,
+        который на больших DataFrame на порядок быстрее построчного форматирования
+        DataFrame.to_csv. Формат значений при этом отличается от to_csv: float-колонки
+        с целыми значениями записываются без дробной части (и читаются pd.read_csv
+        как int64), логические значения - как true/false, метки времени - с наносекундами,
+        строки заключаются в кавычки. Если pyarrow не установлен, имена колонок
+        повторяются или Arrow не может преобразовать или записать значения (например,
+        списки в object-колонке), используется DataFrame.to_csv.
+        
+        Args:
+            df (pd.DataFrame): DataFrame для сохранения.
+            path (str): Путь к файлу.
+            engine (str, optional): 'pandas' (DataFrame.to_csv) или 'pyarrow'.
+                По умолчанию 'pandas'.
+        """
+        if engine != 'pyarrow' or not df.columns.is_unique:
+            df.to_csv(path, index=True)
+            return
+        
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            df.to_csv(path, index=True)
+            return
+        
+        # Arrow пишет во временный файл: если запись прервется на неподдерживаемом
+        # типе, в path не останется частично записанного файла
+        tmp_path = f"{path}.tmp"
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            
+            # from_pandas помещает колонки индекса в конец таблицы; как и в to_csv,
+            # переносим их в начало, а неименованным уровням индекса даем пустое имя
+            index_positions = [
+                table.schema.get_field_index(name)
+                for name in table.schema.pandas_metadata['index_columns']
+            ]
+            data_positions = [i for i in range(table.num_columns) if i not in index_positions]
+            table = table.select(index_positions + data_positions)
+            index_names = ['' if name is None else str(name) for name in df.index.names]
+            table = table.rename_columns(index_names + table.column_names[len(index_names):])
+            
+            pa_csv.write_csv(table, tmp_path)
+        except (pa.ArrowException, ValueError, TypeError):
+            # Типы, которые Arrow не может преобразовать или записать в CSV
+            DriveIOHandler._remove_file(tmp_path)
+            df.to_csv(path, index=True)
+            return
+        except OSError:
+            DriveIOHandler._remove_file(tmp_path)
+            raise
+        
+        os.replace(tmp_path, path)
+    
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        """
+        Удаляет файл, если он существует.
+        
+        Args:
+            path (str): Путь к файлу.
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    def _write_dataframe(
+            self, 
+            df: 'pd.DataFrame', 
+            full_path: str, 
+            file_format: str, 
+            compression: Optional[str], 
+            use_dictionary: bool,
+            csv_engine: str
+        ) -> Optional['pa.Table']:
+        """
+        Записывает DataFrame в файл выбранного формата.
+        
+        Args:
+            df (pd.DataFrame): DataFrame (или Dask DataFrame) для сохранения.
+            full_path (str): Путь к файлу.
+            file_format (str): Формат файла ('parquet', 'csv', 'feather', 'pickle').
+            compression (str, optional): Алгоритм сжатия для формата parquet.
+            use_dictionary (bool): Использовать ли словарное кодирование в parquet.
+            csv_engine (str): Способ записи CSV ('pandas' или 'pyarrow').
+            
+        Returns:
+            Optional[pa.Table]: Записанная таблица Arrow для parquet и feather, иначе None.
+            
+        Raises:
+            OSError: Если файл не удалось записать.
+        """
+        table = None
+        if _is_dask_dataframe(df):
+            # Dask DataFrame не загружается в память целиком: каждая партиция
+            # вычисляется и записывается в отдельный файл каталога full_path
+            df.to_parquet(
+                full_path,
+                engine='pyarrow',
+                compression=compression,
+                write_index=True,
+                write_metadata_file=True
+            )
+        elif file_format in ('parquet', 'feather'):
+            import pyarrow as pa
+            
+            # Таблица Arrow строится напрямую из DataFrame (числовые колонки без
+            # копирования), а индекс сохраняется в метаданных pandas, поэтому
+            # reset_index() для feather не требуется
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            
+            if file_format == 'parquet':
+                import pyarrow.parquet as pq
+                
+                pq.write_table(
+                    table,
+                    full_path,
+                    compression=compression,
+                    compression_level=_ZSTD_COMPRESSION_LEVEL if compression == 'zstd' else None,
+                    use_dictionary=use_dictionary,
+                    row_group_size=_PARQUET_ROW_GROUP_SIZE,
+                    data_page_size=_PARQUET_DATA_PAGE_SIZE
+                )
+            else:
+                import pyarrow.feather as feather
+                
+                feather.write_feather(table, full_path, compression='lz4')
+        elif file_format == 'csv':
+            self._write_csv(df, full_path, csv_engine)
+        elif file_format == 'pickle':
+            df.to_pickle(full_path)
+        return table
+    
     def save_dataframe(
             self, 
-            df: pd.DataFrame, 
+            df: 'pd.DataFrame', 
             filename_prefix: str = 'processed_df',
             file_format: str = 'parquet',
             include_timestamp: bool = True,
-            custom_metadata: Optional[Dict[str, Any]] = None
+            custom_metadata: Optional[Dict[str, Any]] = None,
+            compression: Optional[str] = 'zstd',
+            use_dictionary: bool = True,
+            log_func: Optional[Callable[[str], None]] = None,
+            csv_engine: str = 'pandas'
         ) -> str:
         """
         Сохраняет DataFrame на Google Drive.
         
         Args:
-            df (pd.DataFrame): DataFrame для сохранения.
+            df (pd.DataFrame): DataFrame для сохранения. Для данных, не помещающихся
+                в память, можно передать dask.dataframe.DataFrame (только формат parquet):
+                партиции вычисляются и записываются параллельно в отдельные файлы
+                каталога с именем сохраняемого файла.
             filename_prefix (str, optional): Префикс имени файла. По умолчанию 'processed_df'.
             file_format (str, optional): Формат сохранения файла ('parquet', 'csv', 'feather', 'pickle').
                 По умолчанию 'parquet'.
             include_timestamp (bool, optional): Добавлять ли временную метку к имени файла.
                 По умолчанию True.
             custom_metadata (Dict[str, Any], optional): Дополнительные метаданные для сохранения
-                в отдельный JSON-файл. По умолчанию None.
+                в отдельный JSON-файл. По умолчанию None. Вместе с ними сохраняются размер,
+                имена и типы колонок (для parquet и feather - типы Arrow из схемы файла).
+            compression (str, optional): Алгоритм сжатия для формата parquet
+                ('zstd', 'snappy', 'gzip' и др.) или None для записи без сжатия.
+                По умолчанию 'zstd'. Файлы feather всегда сжимаются алгоритмом lz4.
+            use_dictionary (bool, optional): Использовать ли словарное кодирование колонок
+                в формате parquet. Особенно эффективно для строковых колонок с небольшим
+                числом уникальных значений. По умолчанию True.
+            log_func (Callable[[str], None], optional): Функция вывода сообщений о ходе
+                сохранения и об ошибках (например, лог UI при сохранении в фоновом потоке).
+                По умолчанию None - сообщения выводятся через print.
+            csv_engine (str, optional): Способ записи формата csv: 'pandas' (DataFrame.to_csv)
+                или 'pyarrow' (многопоточный pyarrow.csv, значительно быстрее на больших
+                DataFrame, но форматирует числа, логические значения и даты иначе,
+                чем to_csv). По умолчанию 'pandas'.
                 
         Returns:
             str: Полный путь к сохраненному файлу или пустая строка в случае ошибки.
@@ -104,18 +332,29 @@ class DriveIOHandler:
             ValueError: Если указан неподдерживаемый формат файла.
             IOError: Если возникла ошибка при сохранении файла.
         """
+        log = log_func if log_func is not None else print
+        
         try:
-            # Проверяем, смонтирован ли Drive
-            if not self._ensure_drive_mounted():
-                print("Ошибка: Google Drive не смонтирован или недоступен")
-                return ""
-            
             # Проверяем поддерживаемые форматы
             valid_formats = ['parquet', 'csv', 'feather', 'pickle']
             if file_format not in valid_formats:
                 raise ValueError(f"Неподдерживаемый формат файла: '{file_format}'. "
                               f"Поддерживаемые форматы: {', '.join(valid_formats)}")
             
+            valid_csv_engines = ['pandas', 'pyarrow']
+            if csv_engine not in valid_csv_engines:
+                raise ValueError(f"Неподдерживаемый способ записи CSV: '{csv_engine}'. "
+                              f"Поддерживаемые значения: {', '.join(valid_csv_engines)}")
+            
+            is_dask = _is_dask_dataframe(df)
+            if is_dask and file_format != 'parquet':
+                raise ValueError("Dask DataFrame может быть сохранен только в формате parquet")
+            
+            # Проверяем, смонтирован ли Drive (только при первом сохранении)
+            if not self._mounted and not self._ensure_drive_mounted(log):
+                log("Ошибка: Google Drive не смонтирован или недоступен")
+                return ""
+            
             # Формируем имя файла
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S') if include_timestamp else ''
             if timestamp:
@@ -127,41 +366,63 @@ class DriveIOHandler:
             full_path = os.path.join(self.base_save_path, filename)
             
             # Сохраняем DataFrame в выбранном формате
-            if file_format == 'parquet':
-                df.to_parquet(full_path, index=True)
-            elif file_format == 'csv':
-                df.to_csv(full_path, index=True)
-            elif file_format == 'feather':
-                # Feather не поддерживает сохранение индекса напрямую
-                df_with_idx = df.reset_index()
-                df_with_idx.to_feather(full_path)
-            elif file_format == 'pickle':
-                df.to_pickle(full_path)
-            
-            print(f"DataFrame сохранен в файл: {full_path}")
+            try:
+                table = self._write_dataframe(
+                    df, full_path, file_format, compression, use_dictionary, csv_engine
+                )
+            except OSError:
+                # Диск мог быть отключен после предыдущей проверки: проверяем его
+                # (при необходимости монтируем заново) и повторяем запись один раз
+                self._mounted = False
+                if not self._ensure_drive_mounted(log):
+                    log("Ошибка: Google Drive не смонтирован или недоступен")
+                    return ""
+                table = self._write_dataframe(
+                    df, full_path, file_format, compression, use_dictionary, csv_engine
+                )
+            
+            log(f"DataFrame сохранен в файл: {full_path}")
             
             # Сохраняем метаданные, если они предоставлены
             if custom_metadata:
                 metadata_filename = f"{filename_prefix}_{timestamp}_metadata.json" if timestamp else f"{filename_prefix}_metadata.json"
                 metadata_path = os.path.join(self.base_save_path, metadata_filename)
                 
-                # Добавляем базовую информацию о DataFrame
+                # Добавляем базовую информацию о DataFrame. Для форматов Arrow имена
+                # и типы колонок берутся из схемы записанной таблицы (типы Arrow);
+                # колонки данных идут в схеме первыми, за ними - колонки индекса
+                if table is not None:
+                    data_fields = list(table.schema)[:df.shape[1]]
+                    columns = [field.name for field in data_fields]
+                    dtypes = {field.name: str(field.type) for field in data_fields}
+                else:
+                    columns = list(df.columns)
+                    dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
+                
                 metadata = {
                     'file_format': file_format,
                     'timestamp': str(datetime.now()),
-                    'shape': list(df.shape),
-                    'columns': list(df.columns),
-                    'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+                    # Число строк Dask DataFrame неизвестно без полного вычисления
+                    'shape': [None, len(df.columns)] if is_dask else list(df.shape),
+                    'columns': columns,
+                    'dtypes': dtypes,
                     **custom_metadata
                 }
                 
-                with open(metadata_path, 'w', encoding='utf-8') as f:
-                    json.dump(metadata, f, indent=2, ensure_ascii=False)
+                if orjson is not None:
+                    with open(metadata_path, 'wb') as f:
+                        f.write(orjson.dumps(
+                            metadata,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                        ))
+                else:
+                    with open(metadata_path, 'w', encoding='utf-8') as f:
+                        json.dump(metadata, f, indent=2, ensure_ascii=False)
                     
-                print(f"Метаданные сохранены в файл: {metadata_path}")
+                log(f"Метаданные сохранены в файл: {metadata_path}")
             
             return full_path
         
         except Exception as e:
-            print(f"Ошибка при сохранении DataFrame: {str(e)}")
+            log(f"Ошибка при сохранении DataFrame: {str(e)}")
             return ""
\ No newline at end of file